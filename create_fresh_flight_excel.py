@@ -11,6 +11,13 @@ FLIGHT_PRICES_SHEET_NAME = 'Flight Prices'
 ROUTE_HEADERS = ['Code', 'Commodity', 'Origin', 'Origin_Code', 'Destination', 'Destination_Code', 'Duration_Months']
 SCHEDULED_DAYS = (4, 10, 17, 24)
 
+# Shared header styles, built once (same look as flight_scraper)
+_THIN = Side(style='thin')
+THIN_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+HEADER_FILL = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+BOLD_FONT = Font(bold=True)
+CENTER_ALIGN = Alignment(horizontal='center', vertical='center')
+
 DEFAULT_ROUTES = [
     {'code': '007331101', 'commodity_ar': 'كلفة تذكرة دوحة _ لندن - دوحة لمدة 6 (Semi flexble التذكرة السياحية) أشهر', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'London', 'destination_code': 'LHR', 'duration_months': 6},
     {'code': '007331102', 'commodity_ar': 'كلفة تذكرة دوحة _ القاهرة - دوحة لمدة 6 (semi flexble التذكرة سياحية ( اشهر', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'Cairo', 'destination_code': 'CAI', 'duration_months': 6},
@@ -57,14 +64,11 @@ def main():
     ws = wb.active
     ws.title = FLIGHT_PRICES_SHEET_NAME
     ws.sheet_view.rightToLeft = False
-    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-    header_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
-
     for col, h in enumerate(ROUTE_HEADERS, 1):
         c = ws.cell(row=1, column=col)
         c.value = h
-        c.font = Font(bold=True)
-        c.fill = header_fill
+        c.font = BOLD_FONT
+        c.fill = HEADER_FILL
     for row_idx, r in enumerate(DEFAULT_ROUTES, 2):
         ws.cell(row=row_idx, column=1).value = r['code']
         ws.cell(row=row_idx, column=2).value = r['commodity_ar']
@@ -82,18 +86,18 @@ def main():
     for col_idx, header in enumerate(flight_headers, 1):
         cell = ws.cell(row=flight_header_row, column=col_idx)
         cell.value = header
-        cell.font = Font(bold=True)
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
+        cell.font = BOLD_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = CENTER_ALIGN
+        cell.border = THIN_BORDER
     scheduled = _scheduled_dates_through_2026()
     for col, (header_text,) in enumerate(scheduled, 7):
         cell = ws.cell(row=flight_header_row, column=col)
         cell.value = header_text
-        cell.font = Font(bold=True)
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
+        cell.font = BOLD_FONT
+        cell.fill = HEADER_FILL
+        cell.alignment = CENTER_ALIGN
+        cell.border = THIN_BORDER
 
     ws.column_dimensions['A'].width = 12
     ws.column_dimensions['B'].width = 60
@@ -7,26 +7,19 @@ Runs the scraper on the 4th, 10th, 17th, and 24th of each month at 9:00 AM
 import schedule
 import time
 from datetime import datetime
-from flight_scraper import FlightPriceScraper
-import json
+from flight_scraper import FlightPriceScraper, FLIGHT_PRICES_NDJSON, setup_logging
 
 
 def run_flight_scraper():
     """Run the flight price scraper"""
     print(f"\n[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Running flight price scraper...")
     try:
+        setup_logging()
         scraper = FlightPriceScraper(headless=True)
-        results = scraper.scrape_all()
         
-        # Save to JSON
-        json_file = 'flight_prices.json'
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        print(f"Prices saved to {json_file}")
-        
-        # Export to Excel
-        excel_file = 'flight_prices.xlsx'
-        scraper.export_to_excel(results, excel_file)
+        # Each route is streamed to NDJSON and appended to Excel as soon as it is scraped
+        scraper.scrape_all(stream_path=FLIGHT_PRICES_NDJSON)
+        print(f"Prices saved to {FLIGHT_PRICES_NDJSON}")
         
         print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] Scraper completed successfully\n")
     except Exception as e:
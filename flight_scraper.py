@@ -5,39 +5,130 @@ Outputs to the same Excel format (route block at top, flight price rows, date co
 Either returns real round-trip prices or fails (no one-way or unlabeled numbers).
 """
 
+import importlib.util
+
+# undetected-chromedriver is imported by _setup_driver on first use: importing it costs ~0.3s at startup
+USE_UNDETECTED = importlib.util.find_spec('undetected_chromedriver') is not None
+
+try:
+    from python_calamine import CalamineWorkbook
+    USE_CALAMINE = True
+except ImportError:
+    USE_CALAMINE = False
+
 try:
-    import undetected_chromedriver as uc
-    USE_UNDETECTED = True
+    from selectolax.lexbor import LexborHTMLParser
+    USE_SELECTOLAX = True
 except ImportError:
-    USE_UNDETECTED = False
+    USE_SELECTOLAX = False
 
+import atexit
 import base64
+import calendar
 import json
+import logging
 import os
+import queue
+import random
 import re
+import sys
+import threading
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+import weakref
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from functools import cached_property, lru_cache, wraps
+from logging.handlers import QueueHandler, QueueListener
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlencode, urlsplit
 
+import requests
+from bs4 import BeautifulSoup
 from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
+from openpyxl.styles.borders import DEFAULT_BORDER
+from openpyxl.styles.fonts import DEFAULT_FONT
+from openpyxl.cell import Cell, WriteOnlyCell
 from openpyxl.utils import get_column_letter
 from selenium import webdriver
-from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
+from selenium.webdriver.remote.client_config import ClientConfig
+from urllib3.exceptions import HTTPError as Urllib3HTTPError
 from webdriver_manager.chrome import ChromeDriverManager
 
+logger = logging.getLogger('flight_scraper')
+_log_listener = None
+
+
+def setup_logging(level: int = logging.INFO) -> None:
+    """Send this module's log lines to stdout through a queue: scraper threads only enqueue, and a single
+    listener thread does the writes. Safe to call more than once."""
+    global _log_listener
+    if _log_listener is not None:
+        return
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    _log_listener = QueueListener(log_queue, handler)
+    logger.addHandler(QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+
 # Excel
 FLIGHT_PRICES_EXCEL = 'flight_prices.xlsx'
 FLIGHT_PRICES_SHEET_NAME = 'Flight Prices'
+FLIGHT_PRICES_NDJSON = 'flight_prices.ndjson'
+# Scraped prices per (source, origin, destination, dates), kept beside the workbook: reused across runs within the TTL
+FLIGHT_PRICE_CACHE = 'flight_cache.json'
+# Airline fares move slower than aggregator results, so their hits are kept longer
+PRICE_CACHE_TTL_SEC = {'airline': 1800, 'aggregator': 900}
+PRICE_CACHE_MISS_TTL_SEC = 60  # "no price" expires sooner so a transient failure is retried soon
+# Parsed route block, keyed by the workbook's mtime and size, so unchanged files are not re-read
+ROUTES_CACHE_SUFFIX = '.routes.cache.json'
+# Listed sources with no direct search URL (a generic page would show wrong numbers); never scraped
+UNIMPLEMENTED_SOURCES = frozenset({'Malaysia Airlines', 'Kuwait Airways', 'Turkish Airlines', 'Pakistan International Airlines'})
 ROUTE_HEADERS = ['Code', 'Commodity', 'Origin', 'Origin_Code', 'Destination', 'Destination_Code', 'Duration_Months']
 FLIGHT_HEADER_MARKER = 'وكالات'
 
+# Shared sheet styles; openpyxl style objects are immutable, so one instance serves every cell
+_THIN = Side(style='thin')
+THIN_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+HEADER_FILL = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+AVG_FILL = PatternFill(start_color='FFE4B5', end_color='FFE4B5', fill_type='solid')
+BOLD_FONT = Font(bold=True)
+CENTER_ALIGN = Alignment(horizontal='center', vertical='center')
+COMMODITY_ALIGN = Alignment(horizontal='right', vertical='center', wrap_text=True)
+# Named styles for header and route block cells, registered once per workbook: one .style assignment per
+# cell instead of separate font/border/fill/alignment/number_format sets
+FLIGHT_CELL_STYLES = {
+    'route_header': {'font': BOLD_FONT, 'fill': HEADER_FILL},
+    'flight_header': {'font': BOLD_FONT, 'fill': HEADER_FILL, 'alignment': CENTER_ALIGN, 'border': THIN_BORDER},
+    'flight_code': {'border': THIN_BORDER, 'alignment': CENTER_ALIGN},
+    'flight_commodity': {'border': THIN_BORDER, 'alignment': COMMODITY_ALIGN},
+    'flight_cell': {'border': THIN_BORDER},
+    'flight_price': {'border': THIN_BORDER, 'number_format': '0'},
+    'flight_avg': {'border': THIN_BORDER, 'fill': AVG_FILL},
+    'flight_avg_price': {'border': THIN_BORDER, 'fill': AVG_FILL, 'number_format': '0'},
+}
+
+# Upper bound on concurrent Chrome instances (one per worker thread)
+MAX_DRIVER_POOL_SIZE = 8
+# A pooled Chrome is quit (and lazily restarted) after this many source scrapes; long sessions slow down
+DRIVER_RECYCLE_AFTER = 20
+# scrape_all's Excel writer saves the workbook after this many changed routes (and once more at the end)
+EXCEL_SAVE_EVERY = 10
+
 # Price validation: round-trip economy only
-LONG_HAUL_CODES = {'LHR', 'LON', 'JFK', 'NYC', 'IST', 'BKK', 'KUL', 'TBS', 'FCO', 'CDG', 'MAD', 'FRA', 'MUC', 'AMS', 'SYD', 'MEL', 'SIN', 'HKG', 'NRT', 'TYO'}
+LONG_HAUL_CODES = frozenset({'LHR', 'LON', 'JFK', 'NYC', 'IST', 'BKK', 'KUL', 'TBS', 'FCO', 'CDG', 'MAD', 'FRA', 'MUC', 'AMS', 'SYD', 'MEL', 'SIN', 'HKG', 'NRT', 'TYO'})
 MIN_QAR_LONG_HAUL = 1000
 MIN_QAR_SHORT_HAUL = 500
 MAX_QAR_LONG_HAUL = 5500
@@ -45,216 +136,791 @@ MAX_QAR_SHORT_HAUL = 4000
 
 # Approximate rates to QAR. USD is pegged ~3.64; update periodically if needed (e.g. for EUR/GBP).
 CURRENCY_TO_QAR = {
-    'QAR': 1.0, 'QR': 1.0, 'ر.ق': 1.0,
-    'USD': 3.64, 'US$': 3.64, '$': 3.64,   # 1 USD ≈ 3.64 QAR (Qatar peg)
-    'AED': 0.99, 'د.إ': 0.99, 'DH': 0.99,  # 1 AED ≈ 0.99 QAR (KAYAK.ae etc.)
-    'EUR': 3.90, '€': 3.90,
-    'GBP': 4.60, '£': 4.60,
-    'SAR': 0.97, 'SR': 0.97,
+    'QAR': 1.0,
+    'USD': 3.64,   # 1 USD ≈ 3.64 QAR (Qatar peg)
+    'AED': 0.99,   # 1 AED ≈ 0.99 QAR (KAYAK.ae etc.)
+    'EUR': 3.90,
+    'GBP': 4.60,
+    'SAR': 0.97,
     'BHD': 9.65, 'KWD': 11.85, 'OMR': 9.46,
 }
+# Every raw symbol/alias a price regex can capture -> ISO code (matching is case-insensitive, so both cases are listed)
+CURRENCY_CODES = {
+    alias: code
+    for code, aliases in {
+        'QAR': ('QAR', 'QR', 'ر.ق'),
+        'USD': ('USD', 'US$', '$'),
+        'AED': ('AED', 'د.إ', 'DH'),
+        'EUR': ('EUR', '€'),
+        'GBP': ('GBP', '£'),
+        'SAR': ('SAR', 'SR'),
+        'BHD': ('BHD',), 'KWD': ('KWD',), 'OMR': ('OMR',),
+    }.items()
+    for raw in aliases
+    for alias in (raw, raw.lower(), raw.title())
+}
+
+# Ad/analytics hosts that hold back the page load event without carrying any fare data.
+BLOCKED_URL_PATTERNS = [
+    '*doubleclick.net*', '*googletagmanager.com*', '*google-analytics.com*',
+    '*facebook.net*', '*segment.io*', '*hotjar.com*', '*optimizely.com*',
+    '*criteo.com*', '*adsrvr.org*', '*adnxs.com*',
+    # Prices are read from DOM text only, so images, web fonts and video are dead weight
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico', '*.woff', '*.woff2', '*.ttf', '*.otf', '*.mp4', '*.webm',
+]
+# Chrome profile prefs: never download images, never prompt for notifications, keep cookies (consent state)
+CHROME_PREFS = {
+    'profile.managed_default_content_settings.images': 2,
+    'profile.default_content_setting_values.notifications': 2,
+    'profile.default_content_setting_values.cookies': 1,
+}
+# Stylesheets stay on: innerText and the visibility checks depend on computed styles.
+# The rest turn off browser services a scraping session never uses (extensions, sync, update pings, audio).
+CHROME_LEAN_ARGS = (
+    '--blink-settings=imagesEnabled=false', '--disable-gpu', '--disable-extensions', '--disable-sync',
+    '--disable-background-networking', '--metrics-recording-only', '--mute-audio',
+)
+
+# What a driver call raises once its browser or chromedriver has died: WebDriver errors, or transport errors
+# from the HTTP channel to chromedriver (connection refused, max retries)
+DRIVER_ERRORS = (WebDriverException, Urllib3HTTPError, OSError)
+# urllib3 connections kept alive to the Selenium Grid (default pool holds a single one). Local Chrome keeps
+# the default: each thread sends one command at a time to its own chromedriver
+WEBDRIVER_POOL_MAXSIZE = 16
+# driver.get returns at DOMContentLoaded; _wait_for_prices covers the rest of the render
+PAGE_LOAD_STRATEGY = 'eager'
+# Generic price containers polled while a results page renders
+PRICE_WAIT_SELECTORS = ("[class*='price']", "[class*='fare']", "[class*='Price']", "[data-testid*='price']", "[data-test-id='price']", ".price", ".fare", "[class*='amount']")
+# Random pause (seconds) between requests from the same driver, to look less like a bot
+REQUEST_JITTER_SEC = (0.5, 1.5)
+
+# Plain-HTTP fetches (sources with fetch='http'); a page containing any marker is treated as a bot challenge
+HTTP_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+# Consecutive HTTP misses after which a source goes straight to Selenium for the rest of the run
+HTTP_MISSES_BEFORE_BROWSER_ONLY = 2
+# HEAD preflight per host before any GET or browser load; only connection/DNS failures mark a host down
+PREFLIGHT_TIMEOUT_SEC = 3
+HTTP_CHALLENGE_MARKERS = ('captcha', 'challenge-platform', 'access denied', 'are you a robot', 'px-block')
+
+# Compiled once at import; the price helpers run for every candidate element on every page
+_AMOUNT = r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
+_CURRENCY_PATTERNS = [  # (pattern, amount group, currency group or fixed currency)
+    (re.compile(_AMOUNT + r'\s*(QAR|QR|USD|US\$|\$|AED|EUR|€|GBP|£)', re.IGNORECASE), 1, 2),
+    (re.compile(r'(QAR|QR|USD|US\$|\$|AED|EUR|€|GBP|£)\s*' + _AMOUNT, re.IGNORECASE), 2, 1),
+    (re.compile(r'\$\s*' + _AMOUNT, re.IGNORECASE), 1, 'USD'),
+    (re.compile(r'£\s*' + _AMOUNT, re.IGNORECASE), 1, 'GBP'),
+    (re.compile(_AMOUNT + r'\s*£', re.IGNORECASE), 1, 'GBP'),
+    (re.compile(r'(?:AED|د\.إ)\s*(\d{1,3}(?:,\d{3})*)', re.IGNORECASE), 1, 'AED'),
+]
+_AMOUNT_INT = r'\d{1,3}(?:,\d{3})*'
+_AMOUNT_DEC = _AMOUNT_INT + r'(?:\.\d{2})?'
+
+
+def _price_alternation(spec):
+    """One named-group alternation over (group, pattern with {amount}, currency); returns (regex, group -> currency)."""
+    parts = [pattern.format(amount=f'(?P<{group}>{amount})') for group, pattern, amount, _ in spec]
+    return re.compile('|'.join(parts), re.IGNORECASE), {group: cur for group, _, _, cur in spec}
+
+
+# Page-source scan: a single finditer pass instead of one full sweep per pattern
+_PAGE_PRICE_RE, _PAGE_PRICE_CURRENCIES = _price_alternation([
+    ('qar', r'(?:QAR|QR)\s*{amount}', _AMOUNT_INT, 'QAR'),
+    ('usd', r'\$\s*{amount}', _AMOUNT_DEC, 'USD'),
+    ('usd_sfx', r'{amount}\s*USD', _AMOUNT_DEC, 'USD'),
+    ('gbp', r'£\s*{amount}', _AMOUNT_DEC, 'GBP'),
+    ('gbp_code', r'GBP\s*{amount}', _AMOUNT_INT, 'GBP'),
+    ('aed', r'(?:AED|د\.إ)\s*{amount}', _AMOUNT_INT, 'AED'),
+    ('aed_sfx', r'{amount}\s*AED', _AMOUNT_INT, 'AED'),
+])
+# British Airways: £123, £1,234, GBP 123, 123 GBP
+_BA_PAGE_PRICE_RE, _BA_PAGE_PRICE_CURRENCIES = _price_alternation([
+    ('gbp', r'£\s*{amount}', _AMOUNT_DEC, 'GBP'),
+    ('gbp_code', r'GBP\s*{amount}', _AMOUNT_INT, 'GBP'),
+    ('gbp_sfx', r'{amount}\s*(?:GBP|£)', _AMOUNT_DEC, 'GBP'),
+])
+PAGE_SCAN_MAX_MATCHES = 50
+# Page-source scan stops here on pages with no in-range match; generous because fares often sit in late inline JSON
+PAGE_SCAN_MAX_CHARS = 3_000_000
+_PRICE_STRIP_RE = re.compile(r'[^\d.,]')
+_DIGITS_2_RE = re.compile(r'\d{2,}')
+
+# True once any of the first 20 matches of a (comma-joined) selector renders 3+ digits
+_PRICE_PRESENT_JS = "return Array.from(document.querySelectorAll(arguments[0])).slice(0, 20).some(e => /\\d{3,}/.test(e.innerText || ''));"
+# innerText of up to 20 matches per selector in one WebDriver call; same parent fallback as _html_texts.
+# The DOM is walked once with the comma-joined selector and each match is filed under every selector
+# it matches, so groups keep selector priority; per-selector queries are only the invalid-selector fallback.
+_PRICE_TEXTS_JS = """
+const sels = arguments[0];
+const groups = sels.map(() => []);
+const seen = sels.map(() => 0);
+const textOf = e => {
+    let t = (e.innerText || '').trim();
+    if (!/\\d{2,}/.test(t) && e.parentElement) {
+        const p = (e.parentElement.innerText || '').trim();
+        if (p && p.length < 500) t = p;
+    }
+    return t;
+};
+const file = (e, i) => {
+    if (seen[i]++ >= 20) return;
+    const t = textOf(e);
+    if (t) groups[i].push(t);
+};
+try {
+    for (const e of document.querySelectorAll(sels.join(', '))) {
+        sels.forEach((sel, i) => { if (e.matches(sel)) file(e, i); });
+    }
+} catch (err) {
+    sels.forEach((sel, i) => {
+        groups[i] = [];
+        seen[i] = 0;
+        try { document.querySelectorAll(sel).forEach(e => file(e, i)); } catch (e) {}
+    });
+}
+return groups;
+"""
+# Direct/nonstop filter toggles, matched in one query
+DIRECT_FILTER_SELECTORS = ("[data-testid*='nonstop']", "[data-testid*='direct']", "[aria-label*='Nonstop']", "[aria-label*='Direct']", "[class*='nonstop']")
+# Click the first visible filter whose text or aria-label says direct/nonstop, in one WebDriver call.
+# Returns the first price element as it was before the click (to wait on its staleness), true if there was
+# none, or null if no filter was found.
+_DIRECT_FILTER_JS = """
+const el = Array.from(document.querySelectorAll(arguments[0])).find(e => {
+    const t = ((e.innerText || '') + ' ' + (e.getAttribute('aria-label') || '')).toLowerCase();
+    return e.offsetParent !== null && /direct|nonstop|non-stop|مباشرة/.test(t);
+});
+if (!el) return null;
+const before = document.querySelector(arguments[1]);
+el.click();
+return before || true;
+"""
+# Cookie-consent / close buttons, in priority order
+CONSENT_BUTTON_SELECTORS = ("button#onetrust-accept-btn-handler", "button[id*='accept']", "button[aria-label*='Accept']", "button[aria-label*='Close']")
+# Click the first rendered, enabled button, trying the selectors in order, in one WebDriver call. Returns true if clicked.
+_CLOSE_DIALOG_JS = """
+for (const sel of arguments[0]) {
+    let el = null;
+    try {
+        el = Array.from(document.querySelectorAll(sel)).find(e => e.getClientRects().length > 0 && !e.disabled);
+    } catch (e) {}
+    if (el) { el.click(); return true; }
+}
+return false;
+"""
 
 ROUND_TRIP_KEYWORDS = ('total', 'round', 'return', 'round-trip', 'roundtrip', 'رحلة ذهاب وعودة')
 ONE_WAY_KEYWORDS = ('one way', 'one-way', 'outbound', 'each way', 'per way', 'single way', 'one way only', 'من جهة واحدة')
 
 
+@lru_cache(maxsize=None)
+def _qar_bounds(dest_code: str) -> Tuple[int, int, bool]:
+    """Price window per destination code (already upper-cased by the route loaders); resolved once per code."""
+    if dest_code in LONG_HAUL_CODES:
+        return MIN_QAR_LONG_HAUL, MAX_QAR_LONG_HAUL, True
+    return MIN_QAR_SHORT_HAUL, MAX_QAR_SHORT_HAUL, False
+
+
+# Search dates for one route: ISO (YYYY-MM-DD) and US (MM/DD/YYYY) forms, formatted once
+TripDates = namedtuple('TripDates', 'dep ret dep_us ret_us')
+# One route's sheet rows, derived once from its prices: source rows in sheet order, (airline, average) for
+# airlines quoted by more than one source, and the overall average (None when no source had a price)
+RouteLayout = namedtuple('RouteLayout', 'sorted_prices airline_averages overall')
+
+
+@lru_cache(maxsize=64)
+def _trip_dates(months: int, today: date) -> TripDates:
+    """Search dates for a stay of `months`: depart in a week, return months*30 days later. Keyed by today's
+    date, so every route and source with the same duration shares one result per day."""
+    dep = today + timedelta(days=7)
+    ret = dep + timedelta(days=months * 30)
+    return TripDates(dep.isoformat(), ret.isoformat(),
+                     f"{dep.month:02d}/{dep.day:02d}/{dep.year}", f"{ret.month:02d}/{ret.day:02d}/{ret.year}")
+
+
+@lru_cache(maxsize=1024)
+def _norm_date_header(text: str) -> str:
+    """Date column header as '%d-%b' ('4-Jan' and '04-Jan-2026' both give '04-Jan'); anything else as is.
+    Memoized: a sheet has one header per scheduled date and they are re-read on every export."""
+    for fmt in ('%d-%b', '%d-%b-%Y'):
+        try:
+            return datetime.strptime(text, fmt).strftime('%d-%b')
+        except ValueError:
+            pass
+    return text
+
+
+@lru_cache(maxsize=512)
+def _ita_matrix_search_url(origin: str, dest: str, dep: str, ret: str) -> str:
+    """ITA Matrix search URL (base64 JSON payload); pure, so repeated route/date combinations are built once."""
+    payload = {
+        "type": "round-trip",
+        "slices": [{
+            "origin": [origin],
+            "dest": [dest],
+            "dates": {
+                "searchDateType": "specific",
+                "departureDate": dep,
+                "departureDateType": "depart",
+                "departureDateModifier": "0",
+                "departureDatePreferredTimes": [],
+                "returnDate": ret,
+                "returnDateType": "depart",
+                "returnDateModifier": "0",
+                "returnDatePreferredTimes": []
+            }
+        }],
+        "options": {"cabin": "COACH", "stops": "-1", "extraStops": "0", "pax": {"adults": "1"}}
+    }
+    enc = base64.b64encode(json.dumps(payload).encode()).decode()
+    return f"https://matrix.itasoftware.com/flights?search={enc}"
+
+
+@lru_cache(maxsize=64)
+def _join_selectors(selectors: Tuple[str, ...]) -> str:
+    """One CSS selector list for a scraper's selector tuple; the tuples are class constants, so each is joined once."""
+    return ', '.join(selectors)
+
+
+class _SharedChromeService(Service):
+    """One chromedriver process for every local Chrome this process starts: start() only launches it if it is
+    not running, and a driver's quit() (which calls stop()) leaves it up. shutdown() really stops it."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._start_lock = threading.Lock()
+
+    def start(self):
+        with self._start_lock:
+            process = getattr(self, 'process', None)
+            if process is None or process.poll() is not None:
+                super().start()
+
+    def stop(self):
+        pass
+
+    def shutdown(self):
+        super().stop()
+
+
+@lru_cache(maxsize=1)
+def _chrome_service() -> _SharedChromeService:
+    """The shared chromedriver service; the binary is resolved by webdriver-manager once per process (a failure
+    is not cached) and the process is stopped at exit."""
+    service = _SharedChromeService(ChromeDriverManager().install())
+    atexit.register(service.shutdown)
+    return service
+
+
+def _retry_transient(tries: int = 2, delay: float = 1.0, exceptions: Tuple[type, ...] = (WebDriverException,)):
+    """Decorator for scrape methods: retry transient WebDriver failures (TimeoutException and
+    StaleElementReferenceException are WebDriverException subclasses) with exponential backoff. Any other
+    error, or the last failed attempt, is raised for the caller (_scrape_source) to log. Retries skip the plain
+    HTTP fetch and, via _load, re-query the page if the driver is already on it instead of navigating again."""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            for attempt in range(tries):
+                self._local.retrying = attempt > 0
+                try:
+                    return fn(self, *args, **kwargs)
+                except exceptions:
+                    if attempt + 1 == tries:
+                        raise
+                    time.sleep(delay * 2 ** attempt)
+                finally:
+                    self._local.retrying = False
+        return wrapper
+    return decorator
+
+
 class FlightPriceScraper:
     """Scrape round-trip, direct-flight prices only. Same Excel format as before."""
 
-    def __init__(self, headless=False, excel_path: str = None):
+    # Price selectors per source, in priority order
+    _QR_PRICE_SELECTORS = ("[class*='price']", "[class*='fare']", "[class*='Price']", "[data-testid*='price']", ".price", ".fare", "span[class*='amount']")
+    # BA uses many class patterns; include generic and parent-context in extractor
+    _BA_PRICE_SELECTORS = (
+        "[class*='price']", "[class*='fare']", "[class*='Price']", "[class*='Fare']",
+        "[class*='amount']", "[class*='Amount']", "[data-testid*='price']", "[data-testid*='fare']",
+        ".price", ".fare", "span[class*='currency']", "div[class*='total']", "[class*='total']",
+    )
+    _KAYAK_PRICE_SELECTORS = ("[data-test-id='price']", "[data-testid='price']", "[data-testid='result-price']", ".Flights-Price-FlightPrice", "[class*='price']", "[class*='Price']", ".result-price", "span[class*='price']")
+    _EDREAMS_PRICE_SELECTORS = ("[class*='price']", "[class*='fare']", "[class*='Price']", "[data-testid*='price']", ".price", ".fare", "span[class*='price']")
+    _CHEAPAIR_PRICE_SELECTORS = ("[class*='price']", "[class*='fare']", "[class*='Price']", "[data-testid*='price']", ".price", ".fare")
+    _ITA_PRICE_SELECTORS = ("[class*='price']", "[class*='fare']", "[class*='Price']", ".price", ".fare", "span[class*='price']")
+
+    def __init__(self, headless=False, excel_path: str = None, workers: int = None, tabs: int = 1, grid_url: str = None,
+                 force_refresh: bool = False):
         self.headless = headless
-        self.driver = None
+        # Ignore cached prices (fresh results are still written back to the cache)
+        self.force_refresh = force_refresh
+        # Selenium Grid hub (e.g. http://hub:4444/wd/hub); pooled drivers become remote sessions on its nodes
+        self.grid_url = grid_url
+        self._local = threading.local()
+        self._driver_pool = queue.Queue()
+        # id(driver) -> source scrapes served; only touched by the thread that has that driver checked out
+        self._driver_uses = {}
         self.excel_path = os.path.abspath(excel_path or FLIGHT_PRICES_EXCEL)
         self.routes = self._get_routes()
-        self.sources = self._get_sources()
+        # Sources without a usable direct search URL never get a driver; kept aside for reporting only
+        all_sources = self._get_sources()
+        self.sources = [s for s in all_sources if s['name'] not in UNIMPLEMENTED_SOURCES]
+        self.skipped_sources = [s for s in all_sources if s['name'] in UNIMPLEMENTED_SOURCES]
+        self.workers = max(1, workers or min(MAX_DRIVER_POOL_SIZE, len(self.sources)))
+        # >1: each checked-out Chrome loads that many of a route's sources at once, one tab each
+        self.tabs = max(1, tabs or 1)
+        # Sheet title -> flight header row; set when the header is written, verified before reuse
+        self._flight_header_row_cache: Dict[str, int] = {}
+        # Open worksheet -> route row index (see _route_row_index); entries go away with their workbook
+        self._route_row_indexes = weakref.WeakKeyDictionary()
+        self._price_cache_lock = threading.Lock()
+        self._price_cache = self._load_price_cache()
+        # One in-flight search per site (each source is its own host), however many workers are free
+        self._host_locks = {s['name']: threading.Semaphore(1) for s in self.sources}
+        # 'http': try a plain GET first and only fall back to Selenium if no price is found
+        self._fetch_strategy = {s['name']: s.get('fetch', 'selenium') for s in self.sources}
+        self._http = requests.Session()
+        self._http.headers.update(HTTP_HEADERS)
+        # Per-run circuit breaker for the HTTP path: consecutive misses per source, and sources switched off
+        self._http_lock = threading.Lock()
+        self._http_misses = {}
+        self._http_disabled = set()
+        # host -> reachable, from one HEAD preflight per host per run
+        self._host_up = {}
+        self._airline_scrapers = {
+            'Qatar Airways': self.scrape_qatar_airways,
+            'British Airways': self.scrape_british_airways,
+        }
+        self._aggregator_scrapers = {
+            'KAYAK': self._scrape_kayak,
+            'eDreams': self._scrape_edreams,
+            'CheapAir': self._scrape_cheapair,
+            'ITA Matrix': self._scrape_ita_matrix,
+        }
+        self._url_builders = {
+            'Qatar Airways': self._qatar_airways_url,
+            'British Airways': self._british_airways_url,
+            'KAYAK': self._kayak_url,
+            'eDreams': self._edreams_url,
+            'CheapAir': self._cheapair_url,
+            'ITA Matrix': self._ita_matrix_url,
+        }
 
     # ---------- Routes ----------
+    def _read_route_rows(self, path: str) -> Iterable[Sequence]:
+        """First 7 columns of the flight sheet, header row included, yielded lazily so the caller can stop at the
+        end of the route block. Read-only, so calamine when available."""
+        if USE_CALAMINE:
+            try:
+                wb = CalamineWorkbook.from_path(path)
+                names = wb.sheet_names
+                sheet = wb.get_sheet_by_name(FLIGHT_PRICES_SHEET_NAME) if FLIGHT_PRICES_SHEET_NAME in names else wb.get_sheet_by_index(0)
+                rows = sheet.to_python(skip_empty_area=False)
+                wb.close()
+            except Exception:
+                rows = None
+            if rows is not None:
+                # calamine returns numbers as floats ('6' -> 6.0) and empty cells as ''
+                return ([int(v) if isinstance(v, float) and v.is_integer() else (v if v != '' else None) for v in row[:7]]
+                        for row in rows)
+        return self._iter_route_rows_openpyxl(path)
+
+    @staticmethod
+    def _iter_route_rows_openpyxl(path: str) -> Iterable[Sequence]:
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb[FLIGHT_PRICES_SHEET_NAME] if FLIGHT_PRICES_SHEET_NAME in wb.sheetnames else wb.active
+            yield from ws.iter_rows(min_row=1, max_col=7, values_only=True)
+        finally:
+            wb.close()
+
+    def _routes_cache_path(self) -> str:
+        return os.path.splitext(self.excel_path)[0] + ROUTES_CACHE_SUFFIX
+
+    @staticmethod
+    def _file_fingerprint(path: str) -> str:
+        st = os.stat(path)
+        return f"{st.st_mtime_ns}:{st.st_size}"
+
+    def _write_routes_cache(self, routes: Optional[List[Dict]]):
+        """Record routes as the parse of the workbook as it is on disk now. Best effort."""
+        try:
+            cache = {'fingerprint': self._file_fingerprint(self.excel_path), 'routes': routes}
+            with open(self._routes_cache_path(), 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+        except (OSError, TypeError, ValueError):
+            pass
+
     def _load_routes_from_excel(self) -> Optional[List[Dict]]:
         path = self.excel_path
         if not os.path.exists(path):
             return None
         try:
-            wb = load_workbook(path, read_only=True, data_only=True)
-            ws = wb[FLIGHT_PRICES_SHEET_NAME] if FLIGHT_PRICES_SHEET_NAME in wb.sheetnames else wb.active
-            if str(ws.cell(row=1, column=1).value or '').strip() != 'Code':
-                wb.close()
+            with open(self._routes_cache_path(), encoding='utf-8') as f:
+                cache = json.load(f)
+            if cache.get('fingerprint') == self._file_fingerprint(path):
+                routes = cache.get('routes')
+                return [self._make_route(**r) for r in routes] if routes else routes
+        except (OSError, ValueError, AttributeError, TypeError):
+            pass
+        routes = self._parse_routes_from_excel(path)
+        self._write_routes_cache(routes)
+        return routes
+
+    def _parse_routes_from_excel(self, path: str) -> Optional[List[Dict]]:
+        try:
+            rows = iter(self._read_route_rows(path))
+            first = next(rows, None)
+            if first is None:
+                return None
+            header = list(first) + [None] * 7
+            if str(header[0] or '').strip() != 'Code':
                 return None
-            col3 = str(ws.cell(row=1, column=3).value or '')
+            col3 = str(header[2] or '')
             if 'Class' in col3 or 'الدرجة' in col3:
-                wb.close()
                 return None
             routes = []
-            for row_idx in range(2, ws.max_row + 1):
-                code = ws.cell(row=row_idx, column=1).value
+            for row in rows:
+                code, commodity_ar, origin, origin_code, dest, dest_code, duration = (list(row) + [None] * 7)[:7]
                 if not code or not str(code).strip():
                     break
-                if FLIGHT_HEADER_MARKER in str(ws.cell(row=row_idx, column=6).value or ''):
+                if FLIGHT_HEADER_MARKER in str(dest_code or ''):
                     break
-                dest = ws.cell(row=row_idx, column=5).value
-                dest_code = ws.cell(row=row_idx, column=6).value
                 if not dest or not dest_code:
                     continue
                 try:
-                    duration = int(ws.cell(row=row_idx, column=7).value or 6)
+                    duration = int(duration or 6)
                 except (TypeError, ValueError):
                     duration = 6
-                origin = str(ws.cell(row=row_idx, column=3).value or 'Doha').strip()
-                origin_code = str(ws.cell(row=row_idx, column=4).value or 'DOH').strip().upper()
-                routes.append({
-                    'code': str(code).strip(),
-                    'origin': origin,
-                    'origin_code': origin_code,
-                    'destination': str(dest).strip(),
-                    'destination_code': str(dest_code).strip().upper(),
-                    'commodity_ar': str(ws.cell(row=row_idx, column=2).value or '').strip(),
-                    'duration_months': duration,
-                })
-            wb.close()
+                routes.append(self._make_route(
+                    str(code).strip(), str(dest).strip(), dest_code, duration,
+                    str(commodity_ar or '').strip(),
+                    origin=str(origin or 'Doha').strip(),
+                    origin_code=origin_code or 'DOH',
+                ))
             return routes if routes else None
         except Exception:
             return None
 
+    # (code, destination, destination_code, duration_months, commodity_ar); all routes depart from Doha
+    _DEFAULT_ROUTE_TABLE = (
+        ('007331101', 'London', 'LHR', 6, 'كلفة تذكرة دوحة _ لندن - دوحة لمدة 6 (Semi flexble التذكرة السياحية) أشهر'),
+        ('007331102', 'Cairo', 'CAI', 6, 'كلفة تذكرة دوحة _ القاهرة - دوحة لمدة 6 (semi flexble التذكرة سياحية ( اشهر'),
+        ('007331103', 'Karachi', 'KHI', 3, 'كلفة تذكرة دوحة_ كراتشي _ دوحة لمدة 3 اشهر ( التذكرة سياحية semi flexble)'),
+        ('007331104', 'Dubai', 'DXB', 6, 'كلفة تذكرة دوحة_ دبي _ دوحة لمدة 6 اشهر ( التذكرة سياحية semi flexble)'),
+        ('007331105', 'Jeddah', 'JED', 6, 'كلفة تذكرة دوحة_جدة _ دوحة لمدة 6 اشهر( التذكرة السياحية semi flexble)'),
+        ('007331106', 'Mumbai', 'BOM', 3, 'كلفة تذكرة دوحة_ بومباي _ دوحة لمدة 3 اشهر ( التذكرة سياحية semi flexble)'),
+        ('007331107', 'Kuala Lumpur', 'KUL', 6, 'كلفة تذكرة دوحة_كولا لمبور _ دوحة لمدة 6 اشهر( التذكرة سياحية semi flexble)'),
+        ('007331108', 'Istanbul', 'IST', 6, 'كلفة تذكرة دوحة_ اسطنبول لمدة 6 اشهر ( التذكرة سياحية semi flexble)'),
+        ('007331109', 'Bangkok', 'BKK', 6, 'كلفة تذكرة دوحة_ بانكوك _ دوحة لمدة 6 اشهر ( التذكرة سياحية semi flexble)'),
+        ('007331110', 'Tbilisi', 'TBS', 6, 'كلفة تذكرة دوحة_تبليسي_ دوحة لمدة 6 اشهر ( التذكرة سياحية semi flexble)'),
+        ('007331111', 'New York', 'JFK', 6, 'كلفة تذكرة دوحة_نيويورك دوحة لمدة 6 اشهر ( التذكرة السياحية semi flexble)'),
+    )
+
+    @staticmethod
+    def _make_route(code, destination, destination_code, duration_months=6, commodity_ar='',
+                    origin='Doha', origin_code='DOH') -> Dict:
+        """Route dict; airport codes are normalised to upper case here, whatever the source (table, sheet, cache)."""
+        return {
+            'code': code,
+            'origin': origin,
+            'origin_code': str(origin_code).strip().upper(),
+            'destination': destination,
+            'destination_code': str(destination_code).strip().upper(),
+            'commodity_ar': commodity_ar,
+            'duration_months': duration_months,
+        }
+
     def _get_default_routes(self) -> List[Dict]:
-        return [
-            {'code': '007331101', 'commodity_ar': 'كلفة تذكرة دوحة _ لندن - دوحة لمدة 6 (Semi flexble التذكرة السياحية) أشهر', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'London', 'destination_code': 'LHR', 'duration_months': 6},
-            {'code': '007331102', 'commodity_ar': 'كلفة تذكرة دوحة _ القاهرة - دوحة لمدة 6 (semi flexble التذكرة سياحية ( اشهر', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'Cairo', 'destination_code': 'CAI', 'duration_months': 6},
-            {'code': '007331103', 'commodity_ar': 'كلفة تذكرة دوحة_ كراتشي _ دوحة لمدة 3 اشهر ( التذكرة سياحية semi flexble)', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'Karachi', 'destination_code': 'KHI', 'duration_months': 3},
-            {'code': '007331104', 'commodity_ar': 'كلفة تذكرة دوحة_ دبي _ دوحة لمدة 6 اشهر ( التذكرة سياحية semi flexble)', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'Dubai', 'destination_code': 'DXB', 'duration_months': 6},
-            {'code': '007331105', 'commodity_ar': 'كلفة تذكرة دوحة_جدة _ دوحة لمدة 6 اشهر( التذكرة السياحية semi flexble)', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'Jeddah', 'destination_code': 'JED', 'duration_months': 6},
-            {'code': '007331106', 'commodity_ar': 'كلفة تذكرة دوحة_ بومباي _ دوحة لمدة 3 اشهر ( التذكرة سياحية semi flexble)', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'Mumbai', 'destination_code': 'BOM', 'duration_months': 3},
-            {'code': '007331107', 'commodity_ar': 'كلفة تذكرة دوحة_كولا لمبور _ دوحة لمدة 6 اشهر( التذكرة سياحية semi flexble)', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'Kuala Lumpur', 'destination_code': 'KUL', 'duration_months': 6},
-            {'code': '007331108', 'commodity_ar': 'كلفة تذكرة دوحة_ اسطنبول لمدة 6 اشهر ( التذكرة سياحية semi flexble)', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'Istanbul', 'destination_code': 'IST', 'duration_months': 6},
-            {'code': '007331109', 'commodity_ar': 'كلفة تذكرة دوحة_ بانكوك _ دوحة لمدة 6 اشهر ( التذكرة سياحية semi flexble)', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'Bangkok', 'destination_code': 'BKK', 'duration_months': 6},
-            {'code': '007331110', 'commodity_ar': 'كلفة تذكرة دوحة_تبليسي_ دوحة لمدة 6 اشهر ( التذكرة سياحية semi flexble)', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'Tbilisi', 'destination_code': 'TBS', 'duration_months': 6},
-            {'code': '007331111', 'commodity_ar': 'كلفة تذكرة دوحة_نيويورك دوحة لمدة 6 اشهر ( التذكرة السياحية semi flexble)', 'origin': 'Doha', 'origin_code': 'DOH', 'destination': 'New York', 'destination_code': 'JFK', 'duration_months': 6},
-        ]
+        return [self._make_route(*row) for row in self._DEFAULT_ROUTE_TABLE]
 
     def _get_routes(self) -> List[Dict]:
         loaded = self._load_routes_from_excel()
+        # Our own saves never change a route block we loaded, so the cache can follow them
+        self._routes_from_excel = bool(loaded)
         if loaded:
             return loaded
         return self._get_default_routes()
 
+    # fetch='http': results are server-rendered, so a plain GET is tried before the browser.
+    # Shared by all instances; treated as read-only.
+    _SOURCE_TABLE = (
+        {'name': 'Qatar Airways', 'name_ar': 'الخطوط القطرية', 'source_code': 'AIRL001', 'type': 'airline', 'fetch': 'selenium'},
+        {'name': 'British Airways', 'name_ar': 'الخطوط البريطانية', 'source_code': 'AIRL018', 'type': 'airline', 'fetch': 'selenium'},
+        {'name': 'Malaysia Airlines', 'name_ar': 'الخطوط الماليزية', 'source_code': 'AIRL024', 'type': 'airline', 'fetch': 'selenium'},
+        {'name': 'Kuwait Airways', 'name_ar': 'الخطوط الكويتية', 'source_code': 'AIRL025', 'type': 'airline', 'fetch': 'selenium'},
+        {'name': 'Turkish Airlines', 'name_ar': 'الخطوط التركية', 'source_code': 'AIRL026', 'type': 'airline', 'fetch': 'selenium'},
+        {'name': 'Pakistan International Airlines', 'name_ar': 'الخطوط الباكستانية', 'source_code': 'AIRL020', 'type': 'airline', 'fetch': 'selenium'},
+        {'name': 'CheapAir', 'name_ar': 'cheapair', 'source_code': 'AIRL028', 'type': 'aggregator', 'fetch': 'selenium'},
+        {'name': 'eDreams', 'name_ar': 'edreams', 'source_code': 'AIRL030', 'type': 'aggregator', 'fetch': 'selenium'},
+        {'name': 'KAYAK', 'name_ar': 'Kayak', 'source_code': 'AIRL028', 'type': 'aggregator', 'fetch': 'http'},
+        {'name': 'ITA Matrix', 'name_ar': 'matrix', 'source_code': 'AIRL028', 'type': 'aggregator', 'fetch': 'selenium'},
+    )
+
     def _get_sources(self) -> List[Dict]:
-        return [
-            {'name': 'Qatar Airways', 'name_ar': 'الخطوط القطرية', 'source_code': 'AIRL001', 'type': 'airline'},
-            {'name': 'British Airways', 'name_ar': 'الخطوط البريطانية', 'source_code': 'AIRL018', 'type': 'airline'},
-            {'name': 'Malaysia Airlines', 'name_ar': 'الخطوط الماليزية', 'source_code': 'AIRL024', 'type': 'airline'},
-            {'name': 'Kuwait Airways', 'name_ar': 'الخطوط الكويتية', 'source_code': 'AIRL025', 'type': 'airline'},
-            {'name': 'Turkish Airlines', 'name_ar': 'الخطوط التركية', 'source_code': 'AIRL026', 'type': 'airline'},
-            {'name': 'Pakistan International Airlines', 'name_ar': 'الخطوط الباكستانية', 'source_code': 'AIRL020', 'type': 'airline'},
-            {'name': 'CheapAir', 'name_ar': 'cheapair', 'source_code': 'AIRL028', 'type': 'aggregator'},
-            {'name': 'eDreams', 'name_ar': 'edreams', 'source_code': 'AIRL030', 'type': 'aggregator'},
-            {'name': 'KAYAK', 'name_ar': 'Kayak', 'source_code': 'AIRL028', 'type': 'aggregator'},
-            {'name': 'ITA Matrix', 'name_ar': 'matrix', 'source_code': 'AIRL028', 'type': 'aggregator'},
-        ]
+        return list(self._SOURCE_TABLE)
 
     # ---------- Driver ----------
+    @property
+    def driver(self):
+        """WebDriver checked out by the current thread (each pool worker drives its own Chrome)."""
+        return getattr(self._local, 'driver', None)
+
+    @driver.setter
+    def driver(self, value):
+        self._local.driver = value
+
+    @staticmethod
+    def _chrome_options(headless: bool) -> Options:
+        chrome_options = Options()
+        if headless:
+            chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_argument('--disable-features=IsolateOrigins,site-per-process')
+        for arg in CHROME_LEAN_ARGS:
+            chrome_options.add_argument(arg)
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('prefs', CHROME_PREFS)
+        chrome_options.page_load_strategy = PAGE_LOAD_STRATEGY
+        return chrome_options
+
     def _setup_driver(self, headless=False):
-        if USE_UNDETECTED:
+        """Start this thread's Chrome: a session on the Selenium Grid at grid_url if set, else a local
+        undetected-chromedriver (falling back to plain chromedriver)."""
+        if USE_UNDETECTED and not self.grid_url:
             try:
+                import undetected_chromedriver as uc
                 options = uc.ChromeOptions()
                 if headless:
                     options.add_argument('--headless=new')
                 options.add_argument('--no-sandbox')
                 options.add_argument('--disable-dev-shm-usage')
+                options.add_argument('--disable-features=IsolateOrigins,site-per-process')
+                for arg in CHROME_LEAN_ARGS:
+                    options.add_argument(arg)
+                options.add_experimental_option('prefs', CHROME_PREFS)
+                options.page_load_strategy = PAGE_LOAD_STRATEGY
                 self.driver = uc.Chrome(options=options, version_main=None)
+                self.driver.implicitly_wait(0)
                 if not headless:
                     self.driver.set_window_size(1920, 1080)
+                self._block_tracking_requests()
                 return
             except Exception:
                 pass
-        chrome_options = Options()
-        if headless:
-            chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=chrome_options)
+        chrome_options = self._chrome_options(headless)
+        if self.grid_url:
+            client_config = ClientConfig(
+                remote_server_addr=self.grid_url, keep_alive=True,
+                init_args_for_pool_manager={'init_args_for_pool_manager': {'maxsize': WEBDRIVER_POOL_MAXSIZE, 'block': False}},
+            )
+            self.driver = webdriver.Remote(command_executor=self.grid_url, options=chrome_options, client_config=client_config)
+        else:
+            self.driver = webdriver.Chrome(service=_chrome_service(), options=chrome_options, keep_alive=True)
+        self.driver.implicitly_wait(0)
         self.driver.set_window_size(1920, 1080)
+        self._block_tracking_requests()
+
+    def _block_tracking_requests(self, extra_patterns: List[str] = None):
+        """Block ad/analytics requests via CDP so driver.get returns sooner. Best effort."""
+        try:
+            self.driver.execute_cdp_cmd('Network.enable', {})
+            self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URL_PATTERNS + (extra_patterns or [])})
+        except Exception:
+            pass
+
+    def _discard_driver(self):
+        """Quit the current thread's driver, best effort, and leave an empty slot in its place."""
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.driver = None
 
     def _close_driver(self):
         if self.driver:
             self.driver.quit()
             self.driver = None
 
-    def _calculate_dates(self, months: int) -> Tuple[str, str]:
-        today = datetime.now()
-        dep = today + timedelta(days=7)
-        ret = dep + timedelta(days=months * 30)
-        return dep.strftime('%Y-%m-%d'), ret.strftime('%Y-%m-%d')
+    def _ensure_driver_alive(self):
+        """Recreate the current thread's driver only if its browser session has died. If the new Chrome fails
+        to start, the driver is left as None and the error is raised."""
+        try:
+            self.driver.current_url
+        except DRIVER_ERRORS:
+            self._driver_uses.pop(id(self.driver), None)
+            self._discard_driver()
+            self._setup_driver(headless=self.headless)
 
-    def _close_dialogs(self):
+    def _clear_storage(self):
+        """Clear localStorage/sessionStorage of the page the current tab is on (a consent flag from one
+        site must not steer the next search). Opaque origins such as about:blank throw, hence the try."""
         try:
-            for sel in ["button#onetrust-accept-btn-handler", "button[id*='accept']", "button[aria-label*='Accept']", "button[aria-label*='Close']"]:
-                try:
-                    btn = WebDriverWait(self.driver, 2).until(EC.element_to_be_clickable((By.CSS_SELECTOR, sel)))
-                    btn.click()
-                    time.sleep(1)
-                    break
-                except Exception:
-                    continue
-        except Exception:
+            self.driver.execute_script(
+                "try { window.localStorage.clear(); window.sessionStorage.clear(); } catch (e) {}")
+        except DRIVER_ERRORS:
             pass
 
-    def _apply_direct_filter(self):
+    def _clear_cookies(self):
+        """Drop the cookies of every site the driver has visited. WebDriver's delete_all_cookies only reaches the
+        current page's domain, so CDP is used when the driver has it. The HTTP cache is kept: it is what makes
+        the next route's visit to the same site cheap."""
         try:
-            for sel in ["[data-testid*='nonstop']", "[data-testid*='direct']", "[aria-label*='Nonstop']", "[aria-label*='Direct']", "[class*='nonstop']"]:
-                try:
-                    for elem in self.driver.find_elements(By.CSS_SELECTOR, sel):
-                        if elem.is_displayed() and ('direct' in (elem.text or '').lower() or 'nonstop' in (elem.text or '').lower() or 'non-stop' in (elem.text or '').lower()):
-                            elem.click()
-                            time.sleep(2)
-                            return
-                except Exception:
-                    continue
+            self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            return
         except Exception:
             pass
+        try:
+            self.driver.delete_all_cookies()
+        except DRIVER_ERRORS:
+            pass
 
-    def _wait_for_prices(self, timeout_sec: int = 20) -> bool:
-        """Wait until at least one price-like element (digits + optional currency) is visible. Returns True if found."""
+    def _reset_driver_state(self):
+        """Clear cookies and storage and park on about:blank so the next page starts clean without restarting Chrome."""
+        self._clear_storage()
+        self._clear_cookies()
         try:
-            for _ in range(timeout_sec):
-                for sel in ["[class*='price']", "[class*='fare']", "[class*='Price']", "[data-testid*='price']", "[data-test-id='price']", ".price", ".fare", "[class*='amount']"]:
-                    try:
-                        elms = self.driver.find_elements(By.CSS_SELECTOR, sel)
-                        for e in elms[:10]:
-                            t = (e.text or '').strip()
-                            if t and re.search(r'\d{3,}', t):
-                                return True
-                    except Exception:
-                        pass
-                time.sleep(1)
+            self.driver.get('about:blank')
+        except DRIVER_ERRORS:
+            pass
+
+    def _load(self, url: str):
+        """Navigate to url, or just focus its tab if _open_tabs already started loading it. On a retry the
+        driver is left where it is if it already reached url."""
+        handle = (getattr(self._local, 'tabs', None) or {}).pop(url, None)
+        if handle:
+            self.driver.switch_to.window(handle)
+        elif not (getattr(self._local, 'retrying', False) and self.driver.current_url == url):
+            self.driver.get(url)
+
+    def _open_tabs(self, route: Dict, sources: List[Dict]):
+        """Start loading each browser-fetched source's page in its own tab without waiting on any of them.
+        If the driver fails here, no tabs are handed out and every source falls back to a plain _load."""
+        self._local.tabs = {}
+        try:
+            self._local.home = self.driver.current_window_handle
+        except WebDriverException:
+            self._local.home = None
+            return
+        for source in sources:
+            builder = self._url_builders.get(source['name'])
+            if not builder or not self._browser_first(source['name']):
+                continue
+            url = builder(route)
+            try:
+                self.driver.switch_to.new_window('tab')
+                # JS navigation returns immediately, unlike driver.get which blocks until the page loads
+                self.driver.execute_script('window.location.href = arguments[0];', url)
+                self._local.tabs[url] = self.driver.current_window_handle
+            except WebDriverException:
+                break
+        try:
+            self.driver.switch_to.window(self._local.home)
+        except WebDriverException:
+            self._local.tabs = {}
+
+    def _close_tabs(self):
+        """Close every tab but the one the driver started on."""
+        home = getattr(self._local, 'home', None)
+        self._local.tabs = {}
+        self._local.home = None
+        if not home:
+            return
+        try:
+            for handle in self.driver.window_handles:
+                if handle != home:
+                    self.driver.switch_to.window(handle)
+                    self._clear_storage()
+                    self.driver.close()
+            self.driver.switch_to.window(home)
+        except DRIVER_ERRORS:
+            pass
+
+    def _start_driver_pool(self, size: int):
+        """Fill the pool with empty slots; each Chrome is started by the first job that checks its slot out."""
+        for _ in range(size):
+            self._driver_pool.put(None)
+
+    def _close_driver_pool(self):
+        while True:
+            try:
+                self.driver = self._driver_pool.get_nowait()
+            except queue.Empty:
+                break
+            if self.driver is None:
+                continue
+            try:
+                self._close_driver()
+            except Exception:
+                self.driver = None
+
+    def _calculate_dates(self, months: int) -> TripDates:
+        return _trip_dates(months, date.today())
+
+    def _close_dialogs(self, timeout_sec: float = 2):
+        """Click away a cookie/consent dialog, polling for one to appear for up to timeout_sec in total."""
+        def _clicked(driver):
+            try:
+                return bool(driver.execute_script(_CLOSE_DIALOG_JS, list(CONSENT_BUTTON_SELECTORS)))
+            except WebDriverException:
+                return False
+        try:
+            WebDriverWait(self.driver, timeout_sec, poll_frequency=0.25).until(_clicked)
         except Exception:
             pass
-        return False
+
+    def _apply_direct_filter(self, settle_sec: int = 6) -> bool:
+        """Click a visible direct/nonstop filter, then wait (up to settle_sec) for the old results to be replaced."""
+        try:
+            before = self.driver.execute_script(_DIRECT_FILTER_JS, _join_selectors(DIRECT_FILTER_SELECTORS), PRICE_WAIT_SELECTORS[0])
+        except WebDriverException:
+            return False
+        if before is None:
+            return False
+        if before is not True:
+            try:
+                WebDriverWait(self.driver, settle_sec, poll_frequency=0.25).until(EC.staleness_of(before))
+            except (TimeoutException, WebDriverException):
+                pass
+        return True
+
+    def _wait_for_prices(self, timeout_sec: int = 20, selectors: Sequence[str] = PRICE_WAIT_SELECTORS) -> bool:
+        """Wait until one of the scraper's price selectors shows a number (3+ digits), polling every 250ms with
+        a single comma-joined query per poll. Returns True if found."""
+        joined = _join_selectors(tuple(selectors))
+
+        def _price_present(driver):
+            try:
+                return bool(driver.execute_script(_PRICE_PRESENT_JS, joined))
+            except WebDriverException:
+                return False
+        try:
+            WebDriverWait(self.driver, timeout_sec, poll_frequency=0.25).until(_price_present)
+            return True
+        except Exception:
+            return False
 
     # ---------- Currency & validation ----------
     def _detect_currency(self, text: str) -> Tuple[Optional[float], str]:
         if not text or not text.strip():
             return None, 'QAR'
-        patterns = [
-            (r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(QAR|QR|USD|US\$|\$|AED|EUR|€|GBP|£)', 1, 2),
-            (r'(QAR|QR|USD|US\$|\$|AED|EUR|€|GBP|£)\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', 2, 1),
-            (r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', 1, 'USD'),
-            (r'£\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', 1, 'GBP'),
-            (r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*£', 1, 'GBP'),
-            (r'(?:AED|د\.إ)\s*(\d{1,3}(?:,\d{3})*)', 1, 'AED'),
-        ]
-        for pat, ng, cg in patterns:
-            m = re.search(pat, text, re.IGNORECASE)
+        for pat, ng, cg in _CURRENCY_PATTERNS:
+            m = pat.search(text)
             if m:
                 try:
                     amount = float(m.group(ng).replace(',', ''))
                     cur = m.group(cg) if isinstance(cg, int) else cg
-                    cur = 'USD' if cur in ('$', 'US$') else ('EUR' if cur == '€' else ('GBP' if cur == '£' else (cur or 'QAR').strip().upper()))
+                    cur = CURRENCY_CODES.get(cur) or cur.upper()
                     if amount > 0:
                         return amount, cur
                 except (ValueError, TypeError, IndexError):
                     pass
-        cleaned = re.sub(r'[^\d.,]', '', text).replace(',', '')
+        cleaned = _PRICE_STRIP_RE.sub('', text).replace(',', '')
         try:
             amount = float(cleaned)
             if amount > 0:
@@ -266,100 +932,206 @@ class FlightPriceScraper:
     def _to_qar(self, amount: float, currency: str) -> float:
         if amount is None or amount <= 0:
             return 0.0
-        c = (currency or 'QAR').strip().upper()
-        if c in ('$', 'US$'):
-            c = 'USD'
-        return round(amount * CURRENCY_TO_QAR.get(c, 1.0), 0)
-
-    def _min_max_qar(self, route: Dict) -> Tuple[int, int]:
-        dest = (route.get('destination_code') or '').upper()
-        is_long = dest in LONG_HAUL_CODES
-        min_q = MIN_QAR_LONG_HAUL if is_long else MIN_QAR_SHORT_HAUL
-        max_q = MAX_QAR_LONG_HAUL if is_long else MAX_QAR_SHORT_HAUL
-        return min_q, max_q
+        return round(amount * CURRENCY_TO_QAR.get(CURRENCY_CODES.get(currency, currency), 1.0), 0)
+
+    def _price_bounds(self, route: Dict) -> Tuple[int, int, bool]:
+        """(min QAR, max QAR, is long-haul) for the route's destination."""
+        return _qar_bounds(route.get('destination_code') or '')
 
     # ---------- Price extraction: prefer round-trip label, accept in-range from round-trip search ----------
     # For long-haul unlabeled we use min 2000 to reduce one-way risk (one-way often 800–1800).
     MIN_QAR_UNLABELED_LONG_HAUL = 2000
 
-    def _extract_round_trip_price(self, selectors: List[str], route: Dict) -> Optional[float]:
-        """Extract price in QAR. Reject one-way labeled; prefer round-trip labeled; accept unlabeled in range (long-haul unlabeled >= 2000)."""
-        min_q, max_q = self._min_max_qar(route)
-        dest = (route.get('destination_code') or '').upper()
-        is_long_haul = dest in LONG_HAUL_CODES
+    @staticmethod
+    def _parse_html(html: str):
+        """Parse html for _html_texts: selectolax's lexbor parser when installed (one C-level parse), else BeautifulSoup on lxml."""
+        return LexborHTMLParser(html) if USE_SELECTOLAX else BeautifulSoup(html, 'lxml')
 
-        candidates = []  # (qar, is_round_trip_label, amount, currency)
-        for selector in selectors:
-            try:
-                for elem in self.driver.find_elements(By.CSS_SELECTOR, selector)[:20]:
-                    text = (elem.text or '').strip()
-                    # Include parent text so we get "Total £350" when price is in child
-                    if not text or not re.search(r'\d{2,}', text):
-                        try:
-                            parent = elem.find_element(By.XPATH, '..')
-                            parent_text = (parent.text or '').strip()
-                            if parent_text and len(parent_text) < 500:
-                                text = parent_text
-                        except Exception:
-                            pass
-                    if not text:
-                        continue
-                    amount, currency = self._detect_currency(text)
-                    if not amount or amount <= 0:
-                        continue
-                    qar = self._to_qar(amount, currency)
-                    if not (min_q <= qar <= max_q):
-                        continue
-                    text_lower = text.lower()
-                    if any(k in text_lower for k in ONE_WAY_KEYWORDS):
-                        continue
-                    # Long-haul unlabeled below threshold: likely one-way, skip
-                    is_round = any(k in text_lower for k in ROUND_TRIP_KEYWORDS)
-                    if is_long_haul and not is_round and qar < self.MIN_QAR_UNLABELED_LONG_HAUL:
-                        continue
-                    candidates.append((qar, is_round, amount, currency))
-            except Exception:
-                continue
+    @staticmethod
+    def _node_text(node) -> str:
+        if USE_SELECTOLAX:
+            # Same joining as get_text(' ', strip=True): stripped text nodes, blank ones dropped
+            return ' '.join(part for part in node.text(separator='\x00', strip=True).split('\x00') if part)
+        return node.get_text(' ', strip=True)
+
+    def _html_texts(self, doc, selector: str) -> List[str]:
+        """Text of up to 20 matches of selector in a _parse_html document; falls back to the parent's text when the node has no number."""
+        texts = []
+        try:
+            nodes = doc.css(selector) if USE_SELECTOLAX else doc.select(selector)
+            for node in nodes[:20]:
+                text = self._node_text(node)
+                if not text or not _DIGITS_2_RE.search(text):
+                    parent = node.parent
+                    parent_text = self._node_text(parent) if parent is not None else ''
+                    if parent_text and len(parent_text) < 500:
+                        text = parent_text
+                if text:
+                    texts.append(text)
+        except Exception:
+            pass
+        return texts
+
+    def _pick_round_trip_price(self, text_groups: Iterable[List[str]], route: Dict) -> Optional[float]:
+        """Pick a QAR price from candidate texts, one group per selector in priority order; stops at the first group with a valid price.
+        Reject one-way labeled; prefer round-trip labeled; accept unlabeled in range (long-haul unlabeled >= 2000)."""
+        min_q, max_q, is_long_haul = self._price_bounds(route)
+
+        candidates = []  # (0 if round-trip labelled else 1, qar, amount, currency): plain min() prefers labelled, then cheapest
+        for texts in text_groups:
+            for text in texts:
+                amount, currency = self._detect_currency(text)
+                if not amount or amount <= 0:
+                    continue
+                qar = self._to_qar(amount, currency)
+                if not (min_q <= qar <= max_q):
+                    continue
+                text_lower = text.lower()
+                if any(k in text_lower for k in ONE_WAY_KEYWORDS):
+                    continue
+                # Long-haul unlabeled below threshold: likely one-way, skip
+                is_round = any(k in text_lower for k in ROUND_TRIP_KEYWORDS)
+                if is_long_haul and not is_round and qar < self.MIN_QAR_UNLABELED_LONG_HAUL:
+                    continue
+                candidates.append((0 if is_round else 1, qar, amount, currency))
             if candidates:
                 break
 
         if candidates:
-            round_only = [c for c in candidates if c[1]]
-            if round_only:
-                best = min(round_only, key=lambda x: x[0])
-            else:
-                best = min(candidates, key=lambda x: x[0])
-            return float(round(best[0]))
+            return float(round(min(candidates)[1]))
+        return None
 
-        # Fallback: scan page source for numbers in range (sites often don't label "total")
-        try:
-            page_text = self.driver.page_source or ""
-        except Exception:
-            page_text = ""
+    def _scan_page_for_price(self, page_text: str, route: Dict, regex=_PAGE_PRICE_RE,
+                             currencies=_PAGE_PRICE_CURRENCIES) -> Optional[float]:
+        """Fallback: scan raw page source for currency-tagged numbers in range (sites often don't label "total")."""
+        min_q, max_q, is_long_haul = self._price_bounds(route)
         fallback_min = max(min_q, self.MIN_QAR_UNLABELED_LONG_HAUL) if is_long_haul else min_q
-        patterns = [
-            (r'(?:QAR|QR)\s*(\d{1,3}(?:,\d{3})*)', 'QAR'),
-            (r'\$\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', 'USD'),
-            (r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*USD', 'USD'),
-            (r'£\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', 'GBP'),
-            (r'(?:GBP|£)\s*(\d{1,3}(?:,\d{3})*)', 'GBP'),
-            (r'(?:AED|د\.إ)\s*(\d{1,3}(?:,\d{3})*)', 'AED'),
-            (r'(\d{1,3}(?:,\d{3})*)\s*AED', 'AED'),
-        ]
         found = []
-        for pattern, cur in patterns:
-            for m in re.finditer(pattern, page_text, re.IGNORECASE):
-                try:
-                    val = float(m.group(1).replace(',', ''))
-                    qar = self._to_qar(val, cur)
-                    if fallback_min <= qar <= max_q:
-                        found.append(qar)
-                except (ValueError, TypeError):
-                    pass
+        for m in regex.finditer(page_text or '', 0, PAGE_SCAN_MAX_CHARS):
+            try:
+                qar = self._to_qar(float(m.group(m.lastgroup).replace(',', '')), currencies[m.lastgroup])
+            except (ValueError, TypeError):
+                continue
+            if fallback_min <= qar <= max_q:
+                found.append(qar)
+                if len(found) >= PAGE_SCAN_MAX_MATCHES:
+                    break
         if found:
             return float(round(min(found)))
         return None
 
+    def _snapshot(self) -> str:
+        """Current DOM as HTML, fetched from the driver in one round-trip."""
+        try:
+            return self.driver.page_source or ""
+        except Exception:
+            return ""
+
+    def _live_texts(self, selectors: Sequence[str]) -> Optional[List[List[str]]]:
+        """Rendered text of each selector's matches, one list per selector, fetched in a single execute_script."""
+        try:
+            groups = self.driver.execute_script(_PRICE_TEXTS_JS, list(selectors))
+        except Exception:
+            return None
+        return groups if isinstance(groups, list) else None
+
+    def _extract_round_trip_price(self, selectors: Sequence[str], route: Dict, extra_scan: Tuple = None) -> Optional[float]:
+        """Extract price in QAR from the live page: rendered selector texts in one call, then a page-source scan.
+        If the script cannot run, the selectors are matched against a page_source snapshot instead. extra_scan,
+        a (regex, currencies) pair for _scan_page_for_price, is a last try on that same snapshot."""
+        groups = self._live_texts(selectors)
+        if groups is None:
+            html = self._snapshot()
+            price = self._extract_round_trip_price_from_html(html, selectors, route)
+        else:
+            price = self._pick_round_trip_price(groups, route)
+            if price:
+                return price
+            html = self._snapshot()
+            price = self._scan_page_for_price(html, route)
+        if not price and extra_scan:
+            price = self._scan_page_for_price(html, route, *extra_scan)
+        return price
+
+    def _extract_round_trip_price_from_html(self, html: str, selectors: Sequence[str], route: Dict,
+                                            scan_page: bool = True) -> Optional[float]:
+        """Selector candidates first, then (with scan_page) a page-source scan. html is a driver snapshot or a plain
+        HTTP response; the latter is parsed without scan_page, since the raw scan of a client-rendered shell would
+        pick up banner fares or inline amounts."""
+        doc = self._parse_html(html)
+        price = self._pick_round_trip_price((self._html_texts(doc, sel) for sel in selectors), route)
+        if price or not scan_page:
+            return price
+        return self._scan_page_for_price(html, route)
+
+    # ---------- Plain HTTP (no browser) for sources that render prices server-side ----------
+    def _fetch_html(self, url: str) -> Optional[str]:
+        """GET url with the shared session. Returns None on errors or bot-challenge pages, so callers fall back to Selenium."""
+        try:
+            response = self._http.get(url, timeout=15)
+            if response.status_code != 200:
+                return None
+            response.encoding = response.encoding or 'utf-8'
+            html = response.text
+        except requests.RequestException:
+            return None
+        lowered = html[:20000].lower()
+        if any(marker in lowered for marker in HTTP_CHALLENGE_MARKERS):
+            return None
+        return html
+
+    def _source_reachable(self, route: Dict, source: Dict) -> bool:
+        """HEAD the source's search URL once per host per run. Any HTTP status counts as up (a 403/503
+        bot wall may still let the browser through), and so does a timeout: CDN-fronted hosts often stall
+        non-browser HEADs, so the browser is left to try. Only a refused connection or DNS failure, seen on
+        two attempts in a row, marks the host down."""
+        builder = self._url_builders.get(source['name'])
+        if builder is None:
+            return True
+        host = urlsplit(builder(route)).netloc
+        with self._http_lock:
+            if host in self._host_up:
+                return self._host_up[host]
+        up = False
+        for _ in range(2):
+            try:
+                self._http.head(f"https://{host}/", timeout=PREFLIGHT_TIMEOUT_SEC, allow_redirects=False)
+                up = True
+            except requests.Timeout:
+                # ConnectTimeout is also a ConnectionError, but a stalled host is not a refusing one
+                up = True
+            except requests.ConnectionError:
+                continue
+            except requests.RequestException:
+                up = True
+            break
+        with self._http_lock:
+            if not up and host not in self._host_up:
+                logger.info("      %s: %s unreachable, skipped for this run", source['name'], host)
+            self._host_up.setdefault(host, up)
+            return self._host_up[host]
+
+    def _browser_first(self, source_name: str) -> bool:
+        """True when the source goes straight to Selenium: not fetch='http', or its HTTP path tripped this run."""
+        return self._fetch_strategy.get(source_name) != 'http' or source_name in self._http_disabled
+
+    def _http_round_trip_price(self, source_name: str, url: str, selectors: Sequence[str], route: Dict) -> Optional[float]:
+        """Try a plain HTTP fetch for sources marked fetch='http'. None means: use Selenium.
+        After HTTP_MISSES_BEFORE_BROWSER_ONLY misses in a row the source skips HTTP for the rest of the run."""
+        if self._browser_first(source_name) or getattr(self._local, 'retrying', False):
+            return None
+        html = self._fetch_html(url)
+        price = self._extract_round_trip_price_from_html(html, selectors, route, scan_page=False) if html else None
+        with self._http_lock:
+            if price:
+                self._http_misses[source_name] = 0
+            else:
+                self._http_misses[source_name] = self._http_misses.get(source_name, 0) + 1
+                if self._http_misses[source_name] >= HTTP_MISSES_BEFORE_BROWSER_ONLY and source_name not in self._http_disabled:
+                    self._http_disabled.add(source_name)
+                    logger.info("      %s: no price over plain HTTP, using the browser only for this run", source_name)
+        return price
+
     # ---------- Scrapers: round-trip + direct only ----------
     def _price_result(self, route: Dict, source: Dict, price: float, airline: str = None) -> Dict:
         return {
@@ -373,251 +1145,180 @@ class FlightPriceScraper:
             'timestamp': datetime.now().isoformat(),
         }
 
+    def _qatar_airways_url(self, route: Dict) -> str:
+        dates = self._calculate_dates(route['duration_months'])
+        return "https://www.qatarairways.com/app/booking/flight-selection?" + urlencode({
+            'widget': 'QR', 'searchType': 'F', 'addTaxToFare': 'Y', 'minPurTime': 0, 'selLang': 'en',
+            'tripType': 'R', 'fromStation': route['origin_code'], 'toStation': route['destination_code'],
+            'departing': dates.dep, 'returning': dates.ret, 'bookingClass': 'E',
+            'adults': 1, 'children': 0, 'infants': 0, 'ofw': 0, 'teenager': 0, 'flexibleDate': 'off', 'allowRedemption': 'N', 'stops': 0,
+        })
+
+    @_retry_transient()
     def scrape_qatar_airways(self, route: Dict) -> Optional[Dict]:
         """Round-trip, direct only."""
-        try:
-            dep, ret = self._calculate_dates(route['duration_months'])
-            url = (f"https://www.qatarairways.com/app/booking/flight-selection?"
-                   f"widget=QR&searchType=F&addTaxToFare=Y&minPurTime=0&selLang=en&"
-                   f"tripType=R&fromStation={route['origin_code']}&toStation={route['destination_code']}&"
-                   f"departing={dep}&returning={ret}&bookingClass=E&"
-                   f"adults=1&children=0&infants=0&ofw=0&teenager=0&flexibleDate=off&allowRedemption=N&stops=0")
-            self.driver.get(url)
-            time.sleep(8)
+        url = self._qatar_airways_url(route)
+        selectors = self._QR_PRICE_SELECTORS
+        price = self._http_round_trip_price('Qatar Airways', url, selectors, route)
+        if not price:
+            self._load(url)
+            self._wait_for_prices(30, selectors)
             self._close_dialogs()
-            self._wait_for_prices(22)
             self._apply_direct_filter()
-            time.sleep(4)
-            price = self._extract_round_trip_price(
-                ["[class*='price']", "[class*='fare']", "[class*='Price']", "[data-testid*='price']", ".price", ".fare", "span[class*='amount']"], route)
-            if price:
-                return self._price_result(route, {'name': 'Qatar Airways', 'name_ar': 'الخطوط القطرية', 'source_code': 'AIRL001'}, price, 'Qatar Airways')
-            return None
-        except Exception as e:
-            print(f"      Error: {e}")
-            return None
+            price = self._extract_round_trip_price(selectors, route)
+        if price:
+            return self._price_result(route, {'name': 'Qatar Airways', 'name_ar': 'الخطوط القطرية', 'source_code': 'AIRL001'}, price, 'Qatar Airways')
+        return None
+
+    def _british_airways_url(self, route: Dict) -> str:
+        dates = self._calculate_dates(route['duration_months'])
+        return "https://www.britishairways.com/nx/b/airselect/en/usa/book/search?" + urlencode({
+            'trip': 'round', 'arrivalDate': dates.ret, 'departureDate': dates.dep,
+            'from': route['origin_code'], 'to': route['destination_code'],
+            'travelClass': 'economy', 'adults': 1, 'youngAdults': 0, 'children': 0, 'infants': 0, 'bound': 'outbound', 'stops': 0,
+        })
 
+    @_retry_transient()
     def scrape_british_airways(self, route: Dict) -> Optional[Dict]:
         """Round-trip, direct only. BA often shows GBP (£); we convert to QAR."""
-        try:
-            dep, ret = self._calculate_dates(route['duration_months'])
-            url = (f"https://www.britishairways.com/nx/b/airselect/en/usa/book/search?"
-                   f"trip=round&arrivalDate={ret}&departureDate={dep}&"
-                   f"from={route['origin_code']}&to={route['destination_code']}&"
-                   f"travelClass=economy&adults=1&youngAdults=0&children=0&infants=0&bound=outbound&stops=0")
-            self.driver.get(url)
-            time.sleep(8)
-            self._close_dialogs()
-            self._wait_for_prices(22)
-            self._apply_direct_filter()
-            time.sleep(4)
-            # BA uses many class patterns; include generic and parent-context in extractor
-            price = self._extract_round_trip_price([
-                "[class*='price']", "[class*='fare']", "[class*='Price']", "[class*='Fare']",
-                "[class*='amount']", "[class*='Amount']", "[data-testid*='price']", "[data-testid*='fare']",
-                ".price", ".fare", "span[class*='currency']", "div[class*='total']", "[class*='total']",
-            ], route)
-            if price:
-                return self._price_result(route, {'name': 'British Airways', 'name_ar': 'الخطوط البريطانية', 'source_code': 'AIRL018'}, price, 'British Airways')
-            # BA-specific: scan page for GBP/£ (they often render price in GBP)
-            price = self._extract_ba_price_from_page(route)
-            if price:
-                return self._price_result(route, {'name': 'British Airways', 'name_ar': 'الخطوط البريطانية', 'source_code': 'AIRL018'}, price, 'British Airways')
-            return None
-        except Exception as e:
-            print(f"      Error: {e}")
-            return None
-
-    def _extract_ba_price_from_page(self, route: Dict) -> Optional[float]:
-        """British Airways: find GBP/£ amounts in page source when element extraction misses."""
-        min_q, max_q = self._min_max_qar(route)
-        dest = (route.get('destination_code') or '').upper()
-        is_long_haul = dest in LONG_HAUL_CODES
-        fallback_min = max(min_q, self.MIN_QAR_UNLABELED_LONG_HAUL) if is_long_haul else min_q
-        try:
-            html = self.driver.page_source or ""
-        except Exception:
-            return None
-        # Match £123, £1,234, GBP 123, 123 GBP
-        patterns = [
-            (r'£\s*(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', 'GBP'),
-            (r'(?:GBP|£)\s*(\d{1,3}(?:,\d{3})*)', 'GBP'),
-            (r'(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)\s*(?:GBP|£)', 'GBP'),
-        ]
-        found = []
-        for pattern, cur in patterns:
-            for m in re.finditer(pattern, html, re.IGNORECASE):
-                try:
-                    val = float(m.group(1).replace(',', ''))
-                    qar = self._to_qar(val, cur)
-                    if fallback_min <= qar <= max_q:
-                        found.append(qar)
-                except (ValueError, TypeError):
-                    pass
-        return float(round(min(found))) if found else None
-
-    def scrape_malaysia_airlines(self, route: Dict) -> Optional[Dict]:
-        return None  # No direct search URL; would show wrong numbers
-
-    def scrape_kuwait_airways(self, route: Dict) -> Optional[Dict]:
+        selectors = self._BA_PRICE_SELECTORS
+        url = self._british_airways_url(route)
+        price = self._http_round_trip_price('British Airways', url, selectors, route)
+        if price:
+            return self._price_result(route, {'name': 'British Airways', 'name_ar': 'الخطوط البريطانية', 'source_code': 'AIRL018'}, price, 'British Airways')
+        self._load(url)
+        self._wait_for_prices(30, selectors)
+        self._close_dialogs()
+        self._apply_direct_filter()
+        # BA-specific last resort: GBP/£ amounts (they often render price in GBP), on the same page snapshot
+        price = self._extract_round_trip_price(selectors, route, (_BA_PAGE_PRICE_RE, _BA_PAGE_PRICE_CURRENCIES))
+        if price:
+            return self._price_result(route, {'name': 'British Airways', 'name_ar': 'الخطوط البريطانية', 'source_code': 'AIRL018'}, price, 'British Airways')
         return None
 
-    def scrape_turkish_airlines(self, route: Dict) -> Optional[Dict]:
-        return None
-
-    def scrape_pia(self, route: Dict) -> Optional[Dict]:
-        return None
+    def _kayak_url(self, route: Dict) -> str:
+        dates = self._calculate_dates(route['duration_months'])
+        return f"https://www.kayak.ae/flights/{route['origin_code']}-{route['destination_code']}/{dates.dep}/{dates.ret}?sort=bestflight_a&fs=stops=0"
 
+    @_retry_transient()
     def _scrape_kayak(self, route: Dict) -> Optional[Dict]:
-        try:
-            dep, ret = self._calculate_dates(route['duration_months'])
-            url = f"https://www.kayak.ae/flights/{route['origin_code']}-{route['destination_code']}/{dep}/{ret}?sort=bestflight_a&fs=stops=0"
-            self.driver.get(url)
-            time.sleep(8)
+        url = self._kayak_url(route)
+        selectors = self._KAYAK_PRICE_SELECTORS
+        price = self._http_round_trip_price('KAYAK', url, selectors, route)
+        if not price:
+            self._load(url)
+            self._wait_for_prices(33, selectors)
             self._close_dialogs()
-            self._wait_for_prices(25)
             self._apply_direct_filter()
-            time.sleep(5)
-            price = self._extract_round_trip_price(
-                ["[data-test-id='price']", "[data-testid='price']", "[data-testid='result-price']", ".Flights-Price-FlightPrice", "[class*='price']", "[class*='Price']", ".result-price", "span[class*='price']"], route)
-            if price:
-                return self._price_result(route, {'name': 'KAYAK', 'name_ar': 'Kayak', 'source_code': 'AIRL028'}, price, 'Various')
-            return None
-        except Exception as e:
-            print(f"      Error: {e}")
-            return None
+            price = self._extract_round_trip_price(selectors, route)
+        if price:
+            return self._price_result(route, {'name': 'KAYAK', 'name_ar': 'Kayak', 'source_code': 'AIRL028'}, price, 'Various')
+        return None
+
+    def _edreams_url(self, route: Dict) -> str:
+        dates = self._calculate_dates(route['duration_months'])
+        return (f"https://www.edreams.qa/travel/#results/"
+                f"type=R;from={route['origin_code']};to={route['destination_code']};"
+                f"dep={dates.dep};ret={dates.ret};directOnly=true")
 
+    @_retry_transient()
     def _scrape_edreams(self, route: Dict) -> Optional[Dict]:
-        try:
-            dep, ret = self._calculate_dates(route['duration_months'])
-            url = (f"https://www.edreams.qa/travel/#results/"
-                   f"type=R;from={route['origin_code']};to={route['destination_code']};"
-                   f"dep={dep};ret={ret};directOnly=true")
-            self.driver.get(url)
-            time.sleep(10)
-            self._close_dialogs()
-            self._wait_for_prices(25)
-            self._apply_direct_filter()
-            time.sleep(5)
-            price = self._extract_round_trip_price(
-                ["[class*='price']", "[class*='fare']", "[class*='Price']", "[data-testid*='price']", ".price", ".fare", "span[class*='price']"], route)
-            if price:
-                return self._price_result(route, {'name': 'eDreams', 'name_ar': 'edreams', 'source_code': 'AIRL030'}, price, 'Various')
-            return None
-        except Exception as e:
-            print(f"      Error: {e}")
-            return None
+        selectors = self._EDREAMS_PRICE_SELECTORS
+        self._load(self._edreams_url(route))
+        self._wait_for_prices(35, selectors)
+        self._close_dialogs()
+        self._apply_direct_filter()
+        price = self._extract_round_trip_price(selectors, route)
+        if price:
+            return self._price_result(route, {'name': 'eDreams', 'name_ar': 'edreams', 'source_code': 'AIRL030'}, price, 'Various')
+        return None
+
+    def _cheapair_url(self, route: Dict) -> str:
+        dates = self._calculate_dates(route['duration_months'])
+        return "https://www.cheapoair.com/air/listing?" + urlencode({
+            'd1': route['origin_code'], 'r1': route['destination_code'], 'dt1': dates.dep_us, 'dtype1': 'A', 'rtype1': 'C',
+            'd2': route['destination_code'], 'r2': route['origin_code'], 'dt2': dates.ret_us, 'dtype2': 'C', 'rtype2': 'A',
+            'tripType': 'ROUNDTRIP', 'cl': 'ECONOMY', 'ad': 1, 'nonstop': 1,
+        }, safe='/')
 
+    @_retry_transient()
     def _scrape_cheapair(self, route: Dict) -> Optional[Dict]:
-        try:
-            dep, ret = self._calculate_dates(route['duration_months'])
-            dep_f = datetime.strptime(dep, '%Y-%m-%d').strftime('%m/%d/%Y')
-            ret_f = datetime.strptime(ret, '%Y-%m-%d').strftime('%m/%d/%Y')
-            url = (f"https://www.cheapoair.com/air/listing?"
-                   f"d1={route['origin_code']}&r1={route['destination_code']}&dt1={dep_f}&dtype1=A&rtype1=C&"
-                   f"d2={route['destination_code']}&r2={route['origin_code']}&dt2={ret_f}&dtype2=C&rtype2=A&"
-                   f"tripType=ROUNDTRIP&cl=ECONOMY&ad=1&nonstop=1")
-            self.driver.get(url)
-            time.sleep(8)
+        url = self._cheapair_url(route)
+        selectors = self._CHEAPAIR_PRICE_SELECTORS
+        price = self._http_round_trip_price('CheapAir', url, selectors, route)
+        if not price:
+            self._load(url)
+            self._wait_for_prices(30, selectors)
             self._close_dialogs()
-            self._wait_for_prices(22)
-            time.sleep(4)
-            price = self._extract_round_trip_price(
-                ["[class*='price']", "[class*='fare']", "[class*='Price']", "[data-testid*='price']", ".price", ".fare"], route)
-            if price:
-                return self._price_result(route, {'name': 'CheapAir', 'name_ar': 'cheapair', 'source_code': 'AIRL028'}, price, 'Various')
-            return None
-        except Exception as e:
-            print(f"      Error: {e}")
-            return None
+            price = self._extract_round_trip_price(selectors, route)
+        if price:
+            return self._price_result(route, {'name': 'CheapAir', 'name_ar': 'cheapair', 'source_code': 'AIRL028'}, price, 'Various')
+        return None
+
+    def _ita_matrix_url(self, route: Dict) -> str:
+        dates = self._calculate_dates(route['duration_months'])
+        return _ita_matrix_search_url(route['origin_code'], route['destination_code'], dates.dep, dates.ret)
 
+    @_retry_transient()
     def _scrape_ita_matrix(self, route: Dict) -> Optional[Dict]:
-        try:
-            dep, ret = self._calculate_dates(route['duration_months'])
-            payload = {
-                "type": "round-trip",
-                "slices": [{
-                    "origin": [route['origin_code']],
-                    "dest": [route['destination_code']],
-                    "dates": {
-                        "searchDateType": "specific",
-                        "departureDate": dep,
-                        "departureDateType": "depart",
-                        "departureDateModifier": "0",
-                        "departureDatePreferredTimes": [],
-                        "returnDate": ret,
-                        "returnDateType": "depart",
-                        "returnDateModifier": "0",
-                        "returnDatePreferredTimes": []
-                    }
-                }],
-                "options": {"cabin": "COACH", "stops": "-1", "extraStops": "0", "pax": {"adults": "1"}}
-            }
-            enc = base64.b64encode(json.dumps(payload).encode()).decode()
-            url = f"https://matrix.itasoftware.com/flights?search={enc}"
-            self.driver.get(url)
-            time.sleep(10)
+        url = self._ita_matrix_url(route)
+        selectors = self._ITA_PRICE_SELECTORS
+        price = self._http_round_trip_price('ITA Matrix', url, selectors, route)
+        if not price:
+            self._load(url)
+            self._wait_for_prices(35, selectors)
             self._close_dialogs()
-            self._wait_for_prices(25)
-            time.sleep(5)
-            price = self._extract_round_trip_price(
-                ["[class*='price']", "[class*='fare']", "[class*='Price']", ".price", ".fare", "span[class*='price']"], route)
-            if price:
-                return self._price_result(route, {'name': 'ITA Matrix', 'name_ar': 'matrix', 'source_code': 'AIRL028'}, price, 'Various')
-            return None
-        except Exception as e:
-            print(f"      Error: {e}")
-            return None
+            price = self._extract_round_trip_price(selectors, route)
+        if price:
+            return self._price_result(route, {'name': 'ITA Matrix', 'name_ar': 'matrix', 'source_code': 'AIRL028'}, price, 'Various')
+        return None
 
     def scrape_aggregator(self, source: Dict, route: Dict) -> Optional[Dict]:
-        name = source['name']
-        if name == 'KAYAK':
-            return self._scrape_kayak(route)
-        if name == 'eDreams':
-            return self._scrape_edreams(route)
-        if name == 'CheapAir':
-            return self._scrape_cheapair(route)
-        if name == 'ITA Matrix':
-            return self._scrape_ita_matrix(route)
-        return None
+        scraper = self._aggregator_scrapers.get(source['name'])
+        return scraper(route) if scraper else None
 
     # ---------- Excel (same format as before) ----------
     SCHEDULED_DAYS = (4, 10, 17, 24)
 
-    def _get_scheduled_dates_through_2026(self) -> List[Tuple[str, datetime]]:
-        from datetime import date
+    @cached_property
+    def scheduled_dates(self) -> List[Tuple[str, date]]:
+        """(header, date) for every scheduled day from today through 2026; built once per scraper."""
         today = date.today()
-        result = []
-        for year in range(today.year, 2027):
-            for month in range(1, 13):
-                if year == 2026 and month > 12:
-                    break
-                for day in self.SCHEDULED_DAYS:
-                    try:
-                        d = date(year, month, day)
-                        if d >= today:
-                            result.append((d.strftime('%d-%b'), d))
-                    except ValueError:
-                        pass
-        return result
+        dates = (
+            date(year, month, day)
+            for year in range(today.year, 2027)
+            for month in range(1, 13)
+            for day in self.SCHEDULED_DAYS
+            if day <= calendar.monthrange(year, month)[1]
+        )
+        return [(d.strftime('%d-%b'), d) for d in dates if d >= today]
+
+    @cached_property
+    def run_date_header(self) -> str:
+        """Header for an unscheduled run's date column; fixed at first use so a run past midnight keeps one column."""
+        return datetime.now().strftime('%d-%b')
 
     def _flight_header_row(self, ws) -> Optional[int]:
-        for r in range(1, ws.max_row + 1):
-            if FLIGHT_HEADER_MARKER in str(ws.cell(row=r, column=6).value or ''):
+        """Row of the flight-agencies header, cached per sheet title and re-checked with one cell read."""
+        cached = self._flight_header_row_cache.get(ws.title)
+        if cached is not None and FLIGHT_HEADER_MARKER in str(ws.cell(row=cached, column=6).value or ''):
+            return cached
+        for r, (val,) in enumerate(ws.iter_rows(min_col=6, max_col=6, values_only=True), 1):
+            if FLIGHT_HEADER_MARKER in str(val or ''):
+                self._flight_header_row_cache[ws.title] = r
                 return r
+        self._flight_header_row_cache.pop(ws.title, None)
         return None
 
     def _ensure_route_block(self, ws) -> int:
         col3 = str(ws.cell(row=1, column=3).value or '')
         if 'Class' in col3 or 'الدرجة' in col3:
             return 0
-        header_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
         if ws.cell(row=1, column=1).value != 'Code':
             for col, h in enumerate(ROUTE_HEADERS, 1):
                 c = ws.cell(row=1, column=col)
                 c.value = h
-                c.font = Font(bold=True)
-                c.fill = header_fill
+                c.style = 'route_header'
         if not ws.cell(row=2, column=1).value:
             for row_idx, r in enumerate(self._get_default_routes(), 2):
                 ws.cell(row=row_idx, column=1).value = r['code']
@@ -628,16 +1329,16 @@ class FlightPriceScraper:
                 ws.cell(row=row_idx, column=6).value = r['destination_code']
                 ws.cell(row=row_idx, column=7).value = r['duration_months']
         last_route_row = 1
-        for r in range(2, ws.max_row + 1):
-            if ws.cell(row=r, column=1).value and FLIGHT_HEADER_MARKER not in str(ws.cell(row=r, column=6).value or ''):
-                last_route_row = r
-            else:
+        for r, values in enumerate(ws.iter_rows(min_row=2, max_col=6, values_only=True), 2):
+            if not values[0] or FLIGHT_HEADER_MARKER in str(values[5] or ''):
                 break
+            last_route_row = r
         return last_route_row + 1
 
     def _column_has_data(self, ws, col: int, from_row: int, to_row: int) -> bool:
-        for r in range(from_row, to_row + 1):
-            val = ws.cell(row=r, column=col).value
+        if to_row < from_row:
+            return False
+        for (val,) in ws.iter_rows(min_row=from_row, max_row=to_row, min_col=col, max_col=col, values_only=True):
             if val is not None and str(val).strip() != '':
                 try:
                     float(str(val).replace(',', ''))
@@ -653,18 +1354,25 @@ class FlightPriceScraper:
                 return (header_text, max_col + 1)
             if not self._column_has_data(ws, col, flight_header_row + 1, ws.max_row):
                 return (header_text, col)
-        return (datetime.now().strftime('%d-%b'), max_col + 1)
+        return (self.run_date_header, max_col + 1)
+
+    @staticmethod
+    def _register_cell_styles(wb):
+        """Add the FLIGHT_CELL_STYLES named styles a workbook does not have yet (a saved file keeps them)."""
+        for name, attrs in FLIGHT_CELL_STYLES.items():
+            if name not in wb.named_styles:
+                # NamedStyle leaves unset parts blank (no font name/size, no border sides); start from a plain cell's
+                wb.add_named_style(NamedStyle(name=name, **{'font': DEFAULT_FONT, 'border': DEFAULT_BORDER, **attrs}))
 
     def _prepare_excel_for_export(self, filename: str):
         filename = os.path.abspath(filename or self.excel_path)
-        thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-        header_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
         flight_headers = [
             'Code', 'Commodity', 'الدرجة المقابلة لها في الخطوط (Class equivalent in airlines)',
             'CPI-Flag', 'رمز المصدر (Source Code)', 'وكالات الخطوط (Flight Agencies)'
         ]
         if os.path.exists(filename):
             wb = load_workbook(filename)
+            self._register_cell_styles(wb)
             ws = wb[FLIGHT_PRICES_SHEET_NAME] if FLIGHT_PRICES_SHEET_NAME in wb.sheetnames else wb.active
             ws.title = FLIGHT_PRICES_SHEET_NAME
             ws.sheet_view.rightToLeft = False
@@ -675,16 +1383,15 @@ class FlightPriceScraper:
                 for col_idx, header in enumerate(flight_headers, 1):
                     cell = ws.cell(row=flight_header_row, column=col_idx)
                     cell.value = header
-                    cell.font = Font(bold=True)
-                    cell.fill = header_fill
-                    cell.alignment = Alignment(horizontal='center', vertical='center')
-                    cell.border = thin_border
+                    cell.style = 'flight_header'
+                self._flight_header_row_cache[ws.title] = flight_header_row
                 max_col = 6
             else:
                 flight_header_row = hrow
                 max_col = max(ws.max_column, 7)
         else:
             wb = Workbook()
+            self._register_cell_styles(wb)
             ws = wb.active
             ws.title = FLIGHT_PRICES_SHEET_NAME
             ws.sheet_view.rightToLeft = False
@@ -693,39 +1400,25 @@ class FlightPriceScraper:
             for col_idx, header in enumerate(flight_headers, 1):
                 cell = ws.cell(row=flight_header_row, column=col_idx)
                 cell.value = header
-                cell.font = Font(bold=True)
-                cell.fill = header_fill
-                cell.alignment = Alignment(horizontal='center', vertical='center')
-                cell.border = thin_border
+                cell.style = 'flight_header'
+            self._flight_header_row_cache[ws.title] = flight_header_row
             max_col = 6
 
-        scheduled_dates = self._get_scheduled_dates_through_2026()
-        def _norm(v):
-            if not v:
-                return None
-            s = str(v).strip()
-            try:
-                return datetime.strptime(s, '%d-%b').strftime('%d-%b')
-            except ValueError:
-                try:
-                    return datetime.strptime(s, '%d-%b-%Y').strftime('%d-%b')
-                except ValueError:
-                    return s
+        scheduled_dates = self.scheduled_dates
         existing_headers = {}
-        for col in range(7, max_col + 1):
-            key = _norm(ws.cell(row=flight_header_row, column=col).value)
-            if key:
-                existing_headers[key] = col
+        if max_col >= 7:
+            header_values = next(ws.iter_rows(min_row=flight_header_row, max_row=flight_header_row, min_col=7, max_col=max_col, values_only=True))
+            for col, value in enumerate(header_values, 7):
+                key = _norm_date_header(str(value).strip()) if value else None
+                if key:
+                    existing_headers[key] = col
         next_col = max_col + 1
         for header_text, _ in scheduled_dates:
             if header_text in existing_headers:
                 continue
             cell = ws.cell(row=flight_header_row, column=next_col)
             cell.value = header_text
-            cell.font = Font(bold=True)
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = thin_border
+            cell.style = 'flight_header'
             existing_headers[header_text] = next_col
             next_col += 1
         max_col = next_col - 1
@@ -733,61 +1426,94 @@ class FlightPriceScraper:
         if date_col > max_col:
             cell = ws.cell(row=flight_header_row, column=date_col)
             cell.value = date_text
-            cell.font = Font(bold=True)
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = thin_border
+            cell.style = 'flight_header'
             max_col = date_col
         row = flight_header_row + 1
-        while ws.cell(row=row, column=1).value is not None:
+        for (code,) in ws.iter_rows(min_row=row, max_col=1, values_only=True):
+            if code is None:
+                break
             row += 1
-        avg_fill = PatternFill(start_color='FFE4B5', end_color='FFE4B5', fill_type='solid')
-        return (wb, ws, date_col, row, thin_border, avg_fill, flight_header_row)
+        return (wb, ws, date_col, row, flight_header_row)
+
+    def _route_row_index(self, ws, flight_header_row: int) -> Dict[str, List[Tuple[int, str, str]]]:
+        """Route code -> its block's (row, CPI flag, source code) rows, from one iter_rows pass below the flight header.
+        Built once per open sheet; if a code has several blocks, the first one is used."""
+        index = self._route_row_indexes.get(ws)
+        if index is not None:
+            return index
+        index = {}
+        prev, block = None, None
+        for r, values in enumerate(ws.iter_rows(min_row=flight_header_row + 1, max_col=5, values_only=True), flight_header_row + 1):
+            code = str(values[0]).strip() if values[0] else None
+            if code != prev:
+                block = index.setdefault(code, []) if code and code not in index else None
+                prev = code
+            if block is not None:
+                block.append((r, str(values[3] or ''), str(values[4] or '')))
+        self._route_row_indexes[ws] = index
+        return index
 
     def _find_existing_rows_for_route(self, ws, flight_header_row: int, route_code: str) -> List[Tuple[int, str, str]]:
-        out = []
-        r = flight_header_row + 1
-        while r <= ws.max_row:
-            code = ws.cell(row=r, column=1).value
-            if not code or str(code).strip() != route_code:
-                break
-            out.append((r, str(ws.cell(row=r, column=4).value or ''), str(ws.cell(row=r, column=5).value or '')))
-            r += 1
-        return out
-
-    def _update_route_date_column(self, ws, route_result: Dict, existing_rows: List[Tuple[int, str, str]], date_col: int) -> None:
-        prices = route_result.get('prices', [])
-        sorted_prices = sorted(prices, key=lambda x: (x.get('airline', 'Various'), x.get('source', '')))
-        airline_avg_groups = {}
+        return self._route_row_index(ws, flight_header_row).get(route_code, [])
+
+    @staticmethod
+    def _route_layout(prices: List[Dict]) -> RouteLayout:
+        keyed = [((p.get('airline', 'Various'), p.get('source', '')), p) for p in prices]
+        keyed.sort(key=itemgetter(0))
+        sorted_prices = [p for _, p in keyed]
+        airline_sums = {}
+        overall_sum = overall_count = 0
         for p in prices:
+            price = p.get('price')
+            if not price:
+                continue
+            overall_sum += price
+            overall_count += 1
             airline = p.get('airline', 'Various')
-            if airline != 'Various' and p.get('price'):
-                airline_avg_groups.setdefault(airline, []).append(p.get('price'))
-        values = [p.get('price') for p in sorted_prices]
-        for airline, plist in airline_avg_groups.items():
-            if len(plist) > 1:
-                values.append(round(sum(plist) / len(plist)))
-        valid_prices = [p.get('price') for p in prices if p.get('price')]
-        if valid_prices:
-            values.append(round(sum(valid_prices) / len(valid_prices)))
-        for i, (row_idx, _, _) in enumerate(existing_rows):
-            if i < len(values) and values[i] is not None:
-                ws.cell(row=row_idx, column=date_col).value = values[i]
-                ws.cell(row=row_idx, column=date_col).number_format = '0'
-
-    def _write_route_to_sheet(self, ws, route_result: Dict, row: int, date_col: int, thin_border, avg_fill) -> int:
+            if airline != 'Various':
+                total, count = airline_sums.get(airline, (0, 0))
+                airline_sums[airline] = (total + price, count + 1)
+        airline_averages = [(airline, total / count) for airline, (total, count) in airline_sums.items() if count > 1]
+        overall = overall_sum / overall_count if overall_count else None
+        return RouteLayout(sorted_prices, airline_averages, overall)
+
+    def _update_route_date_column(self, ws, layout: RouteLayout, existing_rows: List[Tuple[int, str, str]], date_col: int) -> bool:
+        """Write the route's prices into date_col of its existing rows. Returns False when the column already held them."""
+        values = [p.get('price') for p in layout.sorted_prices]
+        values.extend(round(avg) for _, avg in layout.airline_averages)
+        if layout.overall is not None:
+            values.append(round(layout.overall))
+        first_row, last_row = existing_rows[0][0], existing_rows[-1][0]
+        current = [v for (v,) in ws.iter_rows(min_row=first_row, max_row=last_row, min_col=date_col, max_col=date_col, values_only=True)]
+        pending = [(row_idx, cpi_flag, values[i]) for i, (row_idx, cpi_flag, _) in enumerate(existing_rows)
+                   if i < len(values) and values[i] is not None and current[row_idx - first_row] != values[i]]
+        for row_idx, cpi_flag, value in pending:
+            cell = ws.cell(row=row_idx, column=date_col)
+            cell.value = value
+            cell.style = 'flight_avg_price' if cpi_flag.endswith('-averages') else 'flight_price'
+        return bool(pending)
+
+    @staticmethod
+    def _put_row(ws, row: int, row_cells: Sequence[Tuple], appendable: bool):
+        """Write (value, style) pairs into columns 1.. of row, via ws.append when row is the sheet's next free row."""
+        if appendable:
+            cells = []
+            for value, style in row_cells:
+                cell = Cell(ws, value=value)
+                cell.style = style
+                cells.append(cell)
+            ws.append(cells)
+            return
+        for col, (value, style) in enumerate(row_cells, 1):
+            cell = ws.cell(row=row, column=col)
+            cell.value = value
+            cell.style = style
+
+    def _write_route_to_sheet(self, ws, route_result: Dict, layout: RouteLayout, row: int, date_col: int) -> int:
         route = route_result['route']
-        prices = route_result.get('prices', [])
-        sorted_prices = sorted(prices, key=lambda x: (x.get('airline', 'Various'), x.get('source', '')))
         route_start_row = row
-        for price_data in sorted_prices:
-            ws.cell(row=row, column=1).value = route['code']
-            ws.cell(row=row, column=1).alignment = Alignment(horizontal='center', vertical='center')
-            ws.cell(row=row, column=2).value = route['commodity_ar']
-            ws.cell(row=row, column=2).alignment = Alignment(horizontal='right', vertical='center', wrap_text=True)
-            ws.cell(row=row, column=3).value = 'Economy'
-            ws.cell(row=row, column=4).value = 'Y'
-            ws.cell(row=row, column=5).value = price_data.get('source_code', '')
+        appendable = row == ws.max_row + 1
+        for price_data in layout.sorted_prices:
             agency = price_data.get('source_ar', price_data.get('source', ''))
             airline = price_data.get('airline', '')
             src = price_data.get('source', '')
@@ -798,173 +1524,347 @@ class FlightPriceScraper:
                     val = agency
             else:
                 val = agency
-            ws.cell(row=row, column=6).value = val
-            for c in range(1, 7):
-                ws.cell(row=row, column=c).border = thin_border
+            row_cells = (
+                (route['code'], 'flight_code'), (route['commodity_ar'], 'flight_commodity'), ('Economy', 'flight_cell'),
+                ('Y', 'flight_cell'), (price_data.get('source_code', ''), 'flight_cell'), (val, 'flight_cell'),
+            )
+            self._put_row(ws, row, row_cells, appendable)
+            date_cell = ws.cell(row=row, column=date_col)
             p = price_data.get('price')
             if p:
-                ws.cell(row=row, column=date_col).value = p
-                ws.cell(row=row, column=date_col).number_format = '0'
-            ws.cell(row=row, column=date_col).border = thin_border
+                date_cell.value = p
+                date_cell.style = 'flight_price'
+            else:
+                date_cell.style = 'flight_cell'
             row += 1
-        airline_avg_groups = {}
-        for p in prices:
-            if p.get('airline', 'Various') != 'Various' and p.get('price'):
-                airline_avg_groups.setdefault(p['airline'], []).append(p['price'])
         airline_ar_map = {'Qatar Airways': 'القطرية', 'British Airways': 'البريطانية', 'Malaysia Airlines': 'الماليزية', 'Kuwait Airways': 'الكويتية', 'Turkish Airlines': 'التركية', 'Pakistan International Airlines': 'الباكستانية'}
-        for airline, plist in airline_avg_groups.items():
-            if len(plist) <= 1:
-                continue
-            avg_price = sum(plist) / len(plist)
-            for col in range(1, 7):
-                cell = ws.cell(row=row, column=col)
-                cell.border = thin_border
-                cell.fill = avg_fill
-            ws.cell(row=row, column=1).value = route['code']
-            ws.cell(row=row, column=2).value = route['commodity_ar']
-            ws.cell(row=row, column=3).value = 'Economy'
-            ws.cell(row=row, column=4).value = 'N-averages'
-            ws.cell(row=row, column=5).value = ''
-            ws.cell(row=row, column=6).value = f"متوسط المصادر للخطوط {airline_ar_map.get(airline, airline)}"
-            ws.cell(row=row, column=date_col).value = round(avg_price)
-            ws.cell(row=row, column=date_col).number_format = '0'
-            ws.cell(row=row, column=date_col).border = thin_border
-            ws.cell(row=row, column=date_col).fill = avg_fill
-            row += 1
-        all_valid = [p.get('price') for p in prices if p.get('price')]
-        if all_valid:
-            overall = sum(all_valid) / len(all_valid)
-            for col in range(1, 7):
-                ws.cell(row=row, column=col).border = thin_border
-                ws.cell(row=row, column=col).fill = avg_fill
-            ws.cell(row=row, column=1).value = route['code']
-            ws.cell(row=row, column=2).value = route['commodity_ar']
-            ws.cell(row=row, column=3).value = 'Economy'
-            ws.cell(row=row, column=4).value = 'Y-averages'
-            ws.cell(row=row, column=5).value = ''
-            ws.cell(row=row, column=6).value = "متوسط المصادر"
-            ws.cell(row=row, column=date_col).value = round(overall)
-            ws.cell(row=row, column=date_col).number_format = '0'
-            ws.cell(row=row, column=date_col).border = thin_border
-            ws.cell(row=row, column=date_col).fill = avg_fill
+        average_rows = [((route['code'], route['commodity_ar'], 'Economy', 'N-averages', '',
+                          f"متوسط المصادر للخطوط {airline_ar_map.get(airline, airline)}"), avg_price)
+                        for airline, avg_price in layout.airline_averages]
+        if layout.overall is not None:
+            average_rows.append(((route['code'], route['commodity_ar'], 'Economy', 'Y-averages', '', "متوسط المصادر"), layout.overall))
+        for row_values, avg_price in average_rows:
+            self._put_row(ws, row, [(value, 'flight_avg') for value in row_values], appendable)
+            date_cell = ws.cell(row=row, column=date_col)
+            date_cell.value = round(avg_price)
+            date_cell.style = 'flight_avg_price'
             row += 1
         try:
             route_end = row - 1
             if route_end > route_start_row:
                 ws.merge_cells(f'B{route_start_row}:B{route_end}')
-                ws.cell(row=route_start_row, column=2).alignment = Alignment(horizontal='right', vertical='center', wrap_text=True)
+                ws.cell(row=route_start_row, column=2).alignment = COMMODITY_ALIGN
         except Exception:
             pass
         return row
 
-    def _expected_rows_count(self, route_result: Dict) -> int:
-        prices = route_result.get('prices', [])
-        n = len(sorted(prices, key=lambda x: (x.get('airline', 'Various'), x.get('source', ''))))
-        airline_groups = {}
-        for p in prices:
-            if p.get('airline', 'Various') != 'Various' and p.get('price'):
-                airline_groups.setdefault(p['airline'], []).append(p['price'])
-        for plist in airline_groups.values():
-            if len(plist) > 1:
-                n += 1
-        if any(p.get('price') for p in prices):
-            n += 1
-        return n
+    def _expected_rows_count(self, layout: RouteLayout) -> int:
+        return len(layout.sorted_prices) + len(layout.airline_averages) + (layout.overall is not None)
 
-    def append_route_to_excel(self, route_result: Dict, filename: str = None, date_col_override: int = None):
-        filename = os.path.abspath(filename or self.excel_path)
-        wb, ws, date_col, row, thin_border, avg_fill, flight_header_row = self._prepare_excel_for_export(filename)
-        if date_col_override is not None:
-            date_col = date_col_override
+    def _append_route(self, ws, route_result: Dict, row: int, date_col: int, flight_header_row: int) -> Tuple[int, bool]:
+        """Write one route into an open sheet: update its date column if its rows exist, else append a block.
+        Returns the next free row and whether anything was written."""
         route_code = route_result['route']['code']
+        layout = self._route_layout(route_result.get('prices', []))
         existing = self._find_existing_rows_for_route(ws, flight_header_row, route_code)
-        expected = self._expected_rows_count(route_result)
+        expected = self._expected_rows_count(layout)
         if len(existing) == expected and expected > 0:
-            self._update_route_date_column(ws, route_result, existing, date_col)
-        else:
-            self._write_route_to_sheet(ws, route_result, row, date_col, thin_border, avg_fill)
+            return row, self._update_route_date_column(ws, layout, existing, date_col)
+        next_row = self._write_route_to_sheet(ws, route_result, layout, row, date_col)
+        self._route_row_index(ws, flight_header_row).setdefault(route_code, [
+            (r, str(ws.cell(row=r, column=4).value or ''), str(ws.cell(row=r, column=5).value or '')) for r in range(row, next_row)])
+        return next_row, True
+
+    def _finalize_workbook(self, wb, ws, date_col: int, filename: str):
+        for col in range(7, date_col + 1):
+            ws.column_dimensions[get_column_letter(col)].width = 15
+        ws.sheet_view.rightToLeft = False
         wb.save(filename)
+        if self._routes_from_excel and os.path.abspath(filename) == self.excel_path:
+            self._write_routes_cache(self.routes)
+
+    def append_route_to_excel(self, route_result: Dict, filename: str = None, date_col_override: int = None):
+        filename = os.path.abspath(filename or self.excel_path)
+        wb, ws, date_col, row, flight_header_row = self._prepare_excel_for_export(filename)
+        if date_col_override is not None:
+            date_col = date_col_override
+        self._append_route(ws, route_result, row, date_col, flight_header_row)
+        self._finalize_workbook(wb, ws, date_col, filename)
 
     def export_to_excel(self, results: Dict, filename: str = None) -> bool:
         filename = os.path.abspath(filename or self.excel_path)
         try:
-            wb, ws, date_col, row, thin_border, avg_fill, flight_header_row = self._prepare_excel_for_export(filename)
+            wb, ws, date_col, row, flight_header_row = self._prepare_excel_for_export(filename)
             for route_result in results.get('routes', []):
-                route_code = route_result['route']['code']
-                existing = self._find_existing_rows_for_route(ws, flight_header_row, route_code)
-                expected = self._expected_rows_count(route_result)
-                if len(existing) == expected and expected > 0:
-                    self._update_route_date_column(ws, route_result, existing, date_col)
-                else:
-                    row = self._write_route_to_sheet(ws, route_result, row, date_col, thin_border, avg_fill)
-            for col in range(7, date_col + 1):
-                ws.column_dimensions[get_column_letter(col)].width = 15
-            ws.sheet_view.rightToLeft = False
-            wb.save(filename)
+                row, _ = self._append_route(ws, route_result, row, date_col, flight_header_row)
+            self._finalize_workbook(wb, ws, date_col, filename)
             return True
         except Exception as e:
-            print(f"Export error: {e}")
+            logger.error("Export error: %s", e)
             return False
 
-    def scrape_all(self) -> Dict:
-        """Scrape all routes from all sources. One date column per run. Round-trip, direct only."""
-        print("\n" + "="*60)
-        print("FLIGHT PRICE SCRAPER (round-trip, direct only)")
-        print("="*60)
-        print(f"Routes: {len(self.routes)}, Sources: {len(self.sources)}")
-        print("="*60 + "\n")
-        self._setup_driver(headless=self.headless)
-        results = {'timestamp': datetime.now().isoformat(), 'routes': []}
-        run_date_col = None
+    def _excel_writer_loop(self, write_queue: queue.Queue):
+        """Background writer for scrape_all: opens the workbook once, appends each queued route and saves
+        every EXCEL_SAVE_EVERY changed routes. A None item saves whatever is still pending and ends the loop."""
         try:
-            _, _, run_date_col, _, _, _, _ = self._prepare_excel_for_export(self.excel_path)
-        except Exception:
+            wb, ws, date_col, row, flight_header_row = self._prepare_excel_for_export(self.excel_path)
+        except Exception as e:
+            logger.info("  ✗ Excel: %s", e)
+            wb = None
+        # Preparing may already have added headers, so the sheet starts out unsaved
+        unsaved = True
+        pending = 0
+        while True:
+            route_results = write_queue.get()
+            try:
+                if wb is None:
+                    if route_results is None:
+                        return
+                    continue
+                if route_results is not None:
+                    code = route_results['route']['code']
+                    try:
+                        row, changed = self._append_route(ws, route_results, row, date_col, flight_header_row)
+                    except Exception as e:
+                        logger.info("  ✗ [%s] Excel: %s", code, e)
+                        continue
+                    if not changed:
+                        logger.info("  ✓ [%s] Excel already up to date", code)
+                        continue
+                    unsaved = True
+                    pending += 1
+                    logger.info("  ✓ [%s] Written to Excel", code)
+                    if pending < EXCEL_SAVE_EVERY:
+                        continue
+                if unsaved:
+                    try:
+                        self._finalize_workbook(wb, ws, date_col, self.excel_path)
+                        logger.info("  ✓ Saved %d route(s) to Excel", pending)
+                        unsaved = False
+                        pending = 0
+                    except Exception as e:
+                        logger.info("  ✗ Excel save: %s", e)
+                if route_results is None:
+                    return
+            finally:
+                write_queue.task_done()
+
+    def _scrape_source(self, route: Dict, source: Dict) -> Optional[Dict]:
+        """Run one source's scraper for one route on the current thread's driver."""
+        try:
+            if source['type'] == 'airline':
+                scraper = self._airline_scrapers.get(source['name'])
+                price_data = scraper(route) if scraper else None
+            else:
+                price_data = self.scrape_aggregator(source, route)
+            if price_data:
+                price_data['route_code'] = route['code']
+                price_data['source'] = source['name']
+                price_data['source_ar'] = source['name_ar']
+                price_data['source_code'] = source['source_code']
+                logger.info("  [%s] %s: ✓ %s QAR", route['code'], source['name'], price_data.get('price'))
+            else:
+                logger.info("  [%s] %s: ✗ No round-trip price", route['code'], source['name'])
+            time.sleep(random.uniform(*REQUEST_JITTER_SEC))
+            return price_data
+        except Exception as e:
+            logger.info("  [%s] %s: ✗ %s", route['code'], source['name'], e)
+            return None
+
+    # ---------- Price cache ----------
+    def _cache_key(self, route: Dict, source: Dict) -> str:
+        dates = self._calculate_dates(route['duration_months'])
+        return '|'.join((source['name'], route['origin_code'], route['destination_code'], dates.dep, dates.ret))
+
+    def _cache_get(self, key: str, source: Dict) -> Tuple[bool, Optional[Dict]]:
+        """(hit, price_data) for a cached search still inside its source type's TTL; price_data None is a cached miss.
+        Always a miss with force_refresh."""
+        if self.force_refresh:
+            return False, None
+        with self._price_cache_lock:
+            entry = self._price_cache.get(key)
+        if not entry:
+            return False, None
+        ts, price_data = entry
+        ttl = PRICE_CACHE_TTL_SEC.get(source.get('type'), PRICE_CACHE_MISS_TTL_SEC) if price_data else PRICE_CACHE_MISS_TTL_SEC
+        if time.time() - ts >= ttl:
+            return False, None
+        return True, dict(price_data) if price_data else None
+
+    def _cache_put(self, key: str, price_data: Optional[Dict]):
+        with self._price_cache_lock:
+            self._price_cache[key] = (time.time(), dict(price_data) if price_data else None)
+
+    def _price_cache_path(self) -> str:
+        return os.path.join(os.path.dirname(self.excel_path), FLIGHT_PRICE_CACHE)
+
+    def _load_price_cache(self) -> Dict[str, tuple]:
+        """Unexpired entries of the cache file; an unreadable or malformed file counts as empty."""
+        try:
+            with open(self._price_cache_path(), encoding='utf-8') as f:
+                raw = json.load(f)
+            now = time.time()
+            max_ttl = max(PRICE_CACHE_TTL_SEC.values())
+            cache = {}
+            for k, (ts, v) in raw.items():
+                if not isinstance(ts, (int, float)) or not (v is None or isinstance(v, dict)):
+                    return {}
+                if now - ts < max_ttl:
+                    cache[k] = (ts, v)
+            return cache
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def _save_price_cache(self):
+        with self._price_cache_lock:
+            snapshot = dict(self._price_cache)
+        try:
+            with open(self._price_cache_path(), 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+        except OSError:
             pass
-        for route in self.routes:
-            print(f"\n[{route['code']}] {route['origin']} – {route['destination']}")
-            route_results = {'route': route, 'prices': []}
-            for source in self.sources:
-                print(f"  {source['name']}")
-                try:
-                    price_data = None
-                    if source['type'] == 'airline':
-                        if source['name'] == 'Qatar Airways':
-                            price_data = self.scrape_qatar_airways(route)
-                        elif source['name'] == 'British Airways':
-                            price_data = self.scrape_british_airways(route)
-                        elif source['name'] == 'Malaysia Airlines':
-                            price_data = self.scrape_malaysia_airlines(route)
-                        elif source['name'] == 'Kuwait Airways':
-                            price_data = self.scrape_kuwait_airways(route)
-                        elif source['name'] == 'Turkish Airlines':
-                            price_data = self.scrape_turkish_airlines(route)
-                        elif source['name'] == 'Pakistan International Airlines':
-                            price_data = self.scrape_pia(route)
-                    else:
-                        price_data = self.scrape_aggregator(source, route)
-                    if price_data:
-                        price_data['route_code'] = route['code']
-                        price_data['source'] = source['name']
-                        price_data['source_ar'] = source['name_ar']
-                        price_data['source_code'] = source['source_code']
-                        route_results['prices'].append(price_data)
-                        print(f"    ✓ {price_data.get('price')} QAR")
-                    else:
-                        print(f"    ✗ No round-trip price")
-                    time.sleep(3)
-                except Exception as e:
-                    print(f"    ✗ {e}")
-            results['routes'].append(route_results)
+
+    def _run_pooled(self, route: Dict, sources: List[Dict]) -> List[Optional[Dict]]:
+        """Scrape one route from the given sources, answering from the price cache where possible.
+        Only sources that miss the cache take host locks and a driver."""
+        results = [None] * len(sources)
+        pending = []
+        for i, source in enumerate(sources):
+            hit, price_data = self._cache_get(self._cache_key(route, source), source)
+            if hit:
+                results[i] = price_data
+                if price_data:
+                    logger.info("  [%s] %s: ✓ %s QAR (cached)", route['code'], source['name'], price_data.get('price'))
+                else:
+                    logger.info("  [%s] %s: ✗ No round-trip price (cached)", route['code'], source['name'])
+            else:
+                pending.append(i)
+        if pending:
+            scraped = self._run_on_driver(route, [sources[i] for i in pending])
+            for i, price_data in zip(pending, scraped):
+                results[i] = price_data
+                self._cache_put(self._cache_key(route, sources[i]), price_data)
+        return results
+
+    def _run_on_driver(self, route: Dict, sources: List[Dict]) -> List[Optional[Dict]]:
+        """Check a driver out of the pool and scrape one route from the given sources; drivers are reused,
+        never restarted per page. With several sources, their pages load side by side in tabs of that driver.
+        The checked-out driver belongs to this thread alone, so tab switching needs no lock.
+        The sources' host locks are taken first (in a fixed order, so jobs cannot deadlock) and before
+        the driver, so no driver sits idle while its job waits for a busy site. Sources whose host failed the
+        preflight return None without touching a driver."""
+        live = [s for s in sources if self._source_reachable(route, s)]
+        if not live:
+            return [None] * len(sources)
+        locks = [self._host_locks[name] for name in sorted(s['name'] for s in live)]
+        for lock in locks:
+            lock.acquire()
+        self.driver = self._driver_pool.get()
+        try:
             try:
-                self.append_route_to_excel(route_results, self.excel_path, date_col_override=run_date_col)
-                print(f"  ✓ Saved to Excel")
+                if self.driver is None:
+                    self._setup_driver(headless=self.headless)
+                else:
+                    self._ensure_driver_alive()
             except Exception as e:
-                print(f"  ✗ Excel: {e}")
-        self._close_driver()
-        total = sum(len(r['prices']) for r in results['routes'])
-        print("\n" + "="*60)
-        print(f"Done. {total} prices found.")
-        print("="*60)
+                logger.info("  [%s] Chrome failed to start: %s", route['code'], e)
+                self.driver = None
+                return [None] * len(sources)
+            if len(live) > 1:
+                self._open_tabs(route, live)
+            scraped = {source['name']: self._scrape_source(route, source) for source in live}
+            return [scraped.get(source['name']) for source in sources]
+        finally:
+            try:
+                if self.driver is not None:
+                    self._close_tabs()
+                    uses = self._driver_uses.pop(id(self.driver), 0) + len(live)
+                    if uses >= DRIVER_RECYCLE_AFTER:
+                        # Hand back an empty slot; the next job to take it starts a fresh Chrome
+                        self._discard_driver()
+                    else:
+                        self._driver_uses[id(self.driver)] = uses
+                        self._reset_driver_state()
+            except Exception as e:
+                # A dead chromedriver can fail with transport errors (urllib3, OSError); replace the driver
+                logger.info("  [%s] Chrome lost: %s", route['code'], e)
+                self._driver_uses.pop(id(self.driver), None)
+                self._discard_driver()
+            finally:
+                self._driver_pool.put(self.driver)
+                self.driver = None
+                for lock in reversed(locks):
+                    lock.release()
+
+    def scrape_all(self, stream_path: str = None) -> Dict:
+        """Scrape all routes from all sources. One date column per run. Round-trip, direct only.
+        (route, source) pairs run in parallel on a pool of `workers` drivers; with tabs > 1 each job takes
+        up to `tabs` of a route's sources and loads them in tabs of one driver. Each route is handed to a
+        background Excel writer, in route order, as soon as all its sources finish. With stream_path,
+        finished routes are also written there as one JSON line each and not kept in the returned dict."""
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n" + "="*60)
+            logger.info("FLIGHT PRICE SCRAPER (round-trip, direct only)")
+            logger.info("="*60)
+            logger.info("Routes: %d, Sources: %d, Workers: %d, Tabs: %d", len(self.routes), len(self.sources), self.workers, self.tabs)
+            if self.skipped_sources:
+                logger.info("Skipped (no direct search URL): %s", ', '.join(s['name'] for s in self.skipped_sources))
+            logger.info("="*60 + "\n")
+        results = {'timestamp': datetime.now().isoformat(), 'routes': []}
+        total = 0
+        stream = open(stream_path, 'w', encoding='utf-8') if stream_path else None
+        write_queue = queue.Queue()
+        writer = threading.Thread(target=self._excel_writer_loop, args=(write_queue,), daemon=True)
+        writer.start()
+        # Per-route price slots (kept in source order) and count of sources still running
+        slots = [[None] * len(self.sources) for _ in self.routes]
+        remaining = [len(self.sources)] * len(self.routes)
+        next_route = 0
+        try:
+            self._start_driver_pool(self.workers)
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                batches = [range(i, min(i + self.tabs, len(self.sources))) for i in range(0, len(self.sources), self.tabs)]
+                futures = {
+                    executor.submit(self._run_pooled, route, [self.sources[i] for i in batch]): (route_idx, batch)
+                    for route_idx, route in enumerate(self.routes)
+                    for batch in batches
+                }
+                for future in as_completed(futures):
+                    route_idx, batch = futures[future]
+                    try:
+                        scraped = future.result()
+                    except Exception as e:
+                        # Only this batch's slots stay empty; the other routes and sources carry on
+                        logger.info("  [%s] ✗ %s", self.routes[route_idx]['code'], e)
+                        scraped = ()
+                    for source_idx, price_data in zip(batch, scraped):
+                        slots[route_idx][source_idx] = price_data
+                    remaining[route_idx] -= len(batch)
+                    # Flush finished routes in order so the Excel block order matches self.routes
+                    while next_route < len(self.routes) and remaining[next_route] == 0:
+                        route = self.routes[next_route]
+                        route_results = {'route': route, 'prices': [p for p in slots[next_route] if p]}
+                        slots[next_route] = None
+                        next_route += 1
+                        total += len(route_results['prices'])
+                        logger.info("\n[%s] %s – %s: %d prices", route['code'], route['origin'], route['destination'], len(route_results['prices']))
+                        if stream:
+                            stream.write(json.dumps(route_results, ensure_ascii=False) + '\n')
+                            stream.flush()
+                        else:
+                            results['routes'].append(route_results)
+                        write_queue.put(route_results)
+        finally:
+            if stream:
+                stream.close()
+            self._close_driver_pool()
+            self._save_price_cache()
+            write_queue.put(None)
+            writer.join()
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("\n" + "="*60)
+            logger.info("Done. %d prices found.", total)
+            logger.info("="*60)
         return results
 
 
@@ -975,74 +1875,60 @@ def create_fresh_excel(path: str = None) -> str:
         backup = path.replace('.xlsx', '_backup_%s.xlsx' % datetime.now().strftime('%Y%m%d_%H%M'))
         try:
             os.rename(path, backup)
-            print("Backed up to", backup)
+            logger.info("Backed up to %s", backup)
         except OSError:
             os.remove(path)
     scraper = FlightPriceScraper(headless=True)
     routes = scraper._get_default_routes()
-    scheduled = scraper._get_scheduled_dates_through_2026()
-    wb = Workbook()
-    ws = wb.active
-    ws.title = FLIGHT_PRICES_SHEET_NAME
+    scheduled = scraper.scheduled_dates
+    # Write-only: rows are streamed out as they are appended instead of kept as a cell grid
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(FLIGHT_PRICES_SHEET_NAME)
     ws.sheet_view.rightToLeft = False
-    thin_border = Border(left=Side(style='thin'), right=Side(style='thin'), top=Side(style='thin'), bottom=Side(style='thin'))
-    header_fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
-    for col, h in enumerate(ROUTE_HEADERS, 1):
-        c = ws.cell(row=1, column=col)
-        c.value = h
-        c.font = Font(bold=True)
-        c.fill = header_fill
-    for row_idx, r in enumerate(routes, 2):
-        ws.cell(row=row_idx, column=1).value = r['code']
-        ws.cell(row=row_idx, column=2).value = r['commodity_ar']
-        ws.cell(row=row_idx, column=3).value = r['origin']
-        ws.cell(row=row_idx, column=4).value = r['origin_code']
-        ws.cell(row=row_idx, column=5).value = r['destination']
-        ws.cell(row=row_idx, column=6).value = r['destination_code']
-        ws.cell(row=row_idx, column=7).value = r['duration_months']
-    flight_header_row = len(routes) + 2
+    for col, width in zip('ABCDEF', (12, 60, 25, 12, 15, 35)):
+        ws.column_dimensions[col].width = width
+    for col in range(7, 7 + len(scheduled)):
+        ws.column_dimensions[get_column_letter(col)].width = 15
+
+    def _styled(value, header_row=False):
+        cell = WriteOnlyCell(ws, value=value)
+        cell.font = BOLD_FONT
+        cell.fill = HEADER_FILL
+        if header_row:
+            cell.alignment = CENTER_ALIGN
+            cell.border = THIN_BORDER
+        return cell
+    ws.append([_styled(h) for h in ROUTE_HEADERS])
+    for r in routes:
+        ws.append([r['code'], r['commodity_ar'], r['origin'], r['origin_code'], r['destination'], r['destination_code'], r['duration_months']])
     flight_headers = [
         'Code', 'Commodity', 'الدرجة المقابلة لها في الخطوط (Class equivalent in airlines)',
         'CPI-Flag', 'رمز المصدر (Source Code)', 'وكالات الخطوط (Flight Agencies)'
     ]
-    for col_idx, header in enumerate(flight_headers, 1):
-        cell = ws.cell(row=flight_header_row, column=col_idx)
-        cell.value = header
-        cell.font = Font(bold=True)
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
-    for col, (header_text, _) in enumerate(scheduled, 7):
-        cell = ws.cell(row=flight_header_row, column=col)
-        cell.value = header_text
-        cell.font = Font(bold=True)
-        cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = thin_border
-    ws.column_dimensions['A'].width = 12
-    ws.column_dimensions['B'].width = 60
-    ws.column_dimensions['C'].width = 25
-    ws.column_dimensions['D'].width = 12
-    ws.column_dimensions['E'].width = 15
-    ws.column_dimensions['F'].width = 35
-    for col in range(7, 7 + len(scheduled)):
-        ws.column_dimensions[get_column_letter(col)].width = 15
+    ws.append([_styled(h, header_row=True) for h in flight_headers + [header_text for header_text, _ in scheduled]])
     wb.save(path)
-    print("Created", path)
+    logger.info("Created %s", path)
     return path
 
 
 def main():
-    import sys
+    setup_logging()
     if '--fresh-excel' in sys.argv or '-f' in sys.argv:
         create_fresh_excel()
         return
-    scraper = FlightPriceScraper(headless=False)
-    results = scraper.scrape_all()
-    with open('flight_prices.json', 'w', encoding='utf-8') as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
-    print("\nSaved flight_prices.json")
-    scraper.export_to_excel(results)
+    workers = None
+    if '--workers' in sys.argv:
+        workers = int(sys.argv[sys.argv.index('--workers') + 1])
+    tabs = 1
+    if '--tabs' in sys.argv:
+        tabs = int(sys.argv[sys.argv.index('--tabs') + 1])
+    grid_url = None
+    if '--grid' in sys.argv:
+        grid_url = sys.argv[sys.argv.index('--grid') + 1]
+    force_refresh = '--force-refresh' in sys.argv
+    scraper = FlightPriceScraper(headless=False, workers=workers, tabs=tabs, grid_url=grid_url, force_refresh=force_refresh)
+    scraper.scrape_all(stream_path=FLIGHT_PRICES_NDJSON)
+    logger.info("\nSaved %s", FLIGHT_PRICES_NDJSON)
 
 
 if __name__ == '__main__':
@@ -8,10 +8,10 @@ import requests
 from bs4 import BeautifulSoup
 import json
 import re
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import Dict, Optional
 from openpyxl import Workbook, load_workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 import os
 
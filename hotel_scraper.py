@@ -27,6 +27,9 @@ from openpyxl.styles import Font, PatternFill, Alignment
 from openpyxl.utils import get_column_letter
 import os
 
+_PRICE_CLEAN_RE = re.compile(r'[^\d.,]')
+_YEAR_RE = re.compile(r'\b(20\d{2})\b')
+
 
 class HotelPriceScraper:
     """Scraper for hotel prices from booking.com"""
@@ -378,7 +381,7 @@ class HotelPriceScraper:
                                         if month_name.lower() in month_text.lower():
                                             current_month_num = idx
                                             # Extract year (4 digits)
-                                            year_match = re.search(r'\b(20\d{2})\b', month_text)
+                                            year_match = _YEAR_RE.search(month_text)
                                             if year_match:
                                                 current_year = int(year_match.group(1))
                                             break
@@ -406,7 +409,7 @@ class HotelPriceScraper:
                                                                         'July', 'August', 'September', 'October', 'November', 'December'], 1):
                                             if month_name.lower() in month_text.lower():
                                                 current_month_num = idx
-                                                year_match = re.search(r'\b(20\d{2})\b', month_text)
+                                                year_match = _YEAR_RE.search(month_text)
                                                 if year_match:
                                                     current_year = int(year_match.group(1))
                                                 break
@@ -1156,10 +1159,8 @@ class HotelPriceScraper:
     def _extract_price(self, price_text: str) -> Optional[float]:
         """Extract numeric price from text"""
         try:
-            # Remove currency symbols and extract numbers
-            import re
             # Remove common currency symbols and text
-            cleaned = re.sub(r'[^\d.,]', '', price_text)
+            cleaned = _PRICE_CLEAN_RE.sub('', price_text)
             cleaned = cleaned.replace(',', '')
             price = float(cleaned)
             return price